@@ -0,0 +1,250 @@
+"""
+Benchmark harness for the closest pair, scheduling and knapsack modules.
+
+Runs each algorithm over a sweep of seeded workloads and records wall time,
+peak traced memory, memory retained by the result and garbage collections.
+Results are written as JSON so runs from different commits can be compared:
+
+    python benchmarks/run_benchmarks.py --output before.json
+    python benchmarks/run_benchmarks.py --output after.json --compare before.json
+"""
+
+import argparse
+import gc
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import numpy as np
+
+from workloads import ROOT, make_points, make_tasks, make_items, make_heavy_items
+
+from closest_pair import closest_pair_recursive, brute_force, closest_pair_numpy, points_to_array
+from scheduler import schedule_tasks, schedule_tasks_parallel
+from knapsack import (
+    solve_knapsack, solve_knapsack_dense, solve_knapsack_compact, solve_knapsack_sparse
+)
+
+# Sizes swept by default and with --quick
+POINT_COUNTS = (100, 1000, 10000, 100000)
+TASK_COUNTS = (100, 1000, 10000, 100000)
+ITEM_COUNTS = (10, 100, 1000)
+CAPACITIES = (100, 1000, 10000)
+HEAVY_ITEM_COUNTS = (50, 200)
+HEAVY_CAPACITY = 10 ** 9  # Only the sparse solver can handle it
+QUICK_POINT_COUNTS = (100, 1000)
+QUICK_TASK_COUNTS = (100, 1000)
+QUICK_ITEM_COUNTS = (10, 100)
+QUICK_CAPACITIES = (100, 1000)
+QUICK_HEAVY_ITEM_COUNTS = (50,)
+
+# Skip slow implementations on inputs where they would dominate the run
+BRUTE_FORCE_MAX_POINTS = 2000
+PYTHON_DP_MAX_CELLS = 2_000_000  # n * capacity for the pure Python tables
+
+def closest_pair_cases(point_counts, seed):
+    """Yield (benchmark, function, params, setup, run) for the closest pair module."""
+    for n in point_counts:
+        params = {'n': n}
+        setup = lambda n=n: make_points(n, seed)
+        yield ('closest_pair', 'closest_pair_recursive', params, setup, closest_pair_recursive)
+        if n <= BRUTE_FORCE_MAX_POINTS:
+            yield ('closest_pair', 'brute_force', params, setup, brute_force)
+        yield ('closest_pair', 'closest_pair_numpy', params,
+               lambda n=n: points_to_array(make_points(n, seed)), closest_pair_numpy)
+
+def scheduler_cases(task_counts, seed):
+    """Yield (benchmark, function, params, setup, run) for the scheduler module."""
+    for n in task_counts:
+        params = {'n': n}
+        setup = lambda n=n: make_tasks(n, seed)
+        yield ('scheduler', 'schedule_tasks', params, setup, schedule_tasks)
+        yield ('scheduler', 'schedule_tasks_parallel', dict(params, couriers=4), setup,
+               lambda tasks: schedule_tasks_parallel(tasks, 4))
+
+def knapsack_cases(item_counts, capacities, seed):
+    """Yield (benchmark, function, params, setup, run) for the knapsack module."""
+    for n in item_counts:
+        for capacity in capacities:
+            params = {'n': n, 'capacity': capacity}
+            setup = lambda n=n: make_items(n, seed)
+            solvers = [('solve_knapsack', solve_knapsack), ('solve_knapsack_sparse', solve_knapsack_sparse)]
+            if n * capacity <= PYTHON_DP_MAX_CELLS:
+                solvers += [('solve_knapsack_dense', solve_knapsack_dense),
+                            ('solve_knapsack_compact', solve_knapsack_compact)]
+            for name, solver in solvers:
+                yield ('knapsack', name, params, setup,
+                       lambda items, solver=solver, capacity=capacity: solver(items, capacity))
+
+def heavy_knapsack_cases(item_counts, seed):
+    """
+    Yield (benchmark, function, params, setup, run) for huge capacities and
+    weights, where the sparse solver must not pick a table formulation.
+    """
+    for n in item_counts:
+        params = {'n': n, 'capacity': HEAVY_CAPACITY}
+        yield ('knapsack', 'solve_knapsack_sparse', params, lambda n=n: make_heavy_items(n, seed),
+               lambda items: solve_knapsack_sparse(items, HEAVY_CAPACITY))
+
+def measure(setup, run, repeat):
+    """
+    Benchmark one case.
+    
+    Wall time is taken over `repeat` untraced runs, which also count
+    garbage collections per generation; those track how many container
+    objects the call churns through. A separate traced run records the peak
+    memory allocated by the call, and the memory blocks and bytes it
+    allocated that are still retained afterwards, mostly by its result.
+    Tracing starts right before that call, so a snapshot taken after it
+    holds only the call's blocks. CPython keeps no count of every block
+    allocated and freed during a call, so neither figure is a total
+    allocation count.
+    
+    Args:
+        setup (callable): Builds the input; not timed
+        run (callable): Runs the algorithm on the input
+        repeat (int): Number of timed runs
+    
+    Returns:
+        dict: Measurements
+    """
+    data = setup()
+    times = []
+    collections = [0, 0, 0]
+    for _ in range(repeat):
+        gc.collect()
+        before_stats = gc.get_stats()
+        start = time.perf_counter()
+        result = run(data)
+        times.append(time.perf_counter() - start)
+        for generation, (before, after) in enumerate(zip(before_stats, gc.get_stats())):
+            collections[generation] += after['collections'] - before['collections']
+        del result
+    
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = run(data)
+        _, peak = tracemalloc.get_traced_memory()
+        gc.collect()  # Release garbage the call left, e.g. deep chains of tuples
+        snapshot = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    del result
+    # Leave out the snapshot's own allocations
+    retained = snapshot.filter_traces([tracemalloc.Filter(False, tracemalloc.__file__)]).traces
+    
+    return {
+        'wall_time_s': {
+            'min': min(times),
+            'median': statistics.median(times),
+            'max': max(times),
+        },
+        'peak_memory_bytes': peak,
+        'retained_blocks': len(retained),
+        'retained_bytes': sum(trace.size for trace in retained),
+        'gc_collections': [round(count / repeat, 2) for count in collections],
+    }
+
+def git_commit():
+    """Return the current commit hash, or None outside a git checkout."""
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def case_key(result):
+    """Key identifying the same case across result files."""
+    return (result['benchmark'], result['function'], json.dumps(result['params'], sort_keys=True))
+
+def compare(results, baseline_path, threshold):
+    """
+    Print the wall time ratio of every case against a baseline file.
+    
+    Returns:
+        list: Results that got slower than threshold times the baseline
+    """
+    with open(baseline_path) as f:
+        baseline = {case_key(result): result for result in json.load(f)['results']}
+    
+    regressions = []
+    for result in results:
+        old = baseline.get(case_key(result))
+        if old is None:
+            continue
+        ratio = result['wall_time_s']['median'] / max(old['wall_time_s']['median'], 1e-9)
+        flag = ''
+        if ratio > threshold:
+            regressions.append(result)
+            flag = '  <-- slower'
+        print(f"{result['function']:<26} {result['params']}: {ratio:6.2f}x{flag}")
+    return regressions
+
+def main(argv=None):
+    """Run the selected benchmarks and write the results; returns the exit code."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--output', default='benchmark_results.json',
+                        help='JSON file to write results to')
+    parser.add_argument('--only', choices=['closest_pair', 'scheduler', 'knapsack'],
+                        action='append', help='Run only these benchmarks (repeatable)')
+    parser.add_argument('--quick', action='store_true', help='Use small input sizes')
+    parser.add_argument('--repeat', type=int, default=3, help='Timed runs per case')
+    parser.add_argument('--seed', type=int, default=0, help='Workload random seed')
+    parser.add_argument('--compare', metavar='BASELINE',
+                        help='Compare wall times with an earlier results file')
+    parser.add_argument('--threshold', type=float, default=1.25,
+                        help='Slowdown ratio reported as a regression by --compare')
+    args = parser.parse_args(argv)
+    
+    cases = []
+    selected = args.only or ['closest_pair', 'scheduler', 'knapsack']
+    if 'closest_pair' in selected:
+        cases += closest_pair_cases(QUICK_POINT_COUNTS if args.quick else POINT_COUNTS, args.seed)
+    if 'scheduler' in selected:
+        cases += scheduler_cases(QUICK_TASK_COUNTS if args.quick else TASK_COUNTS, args.seed)
+    if 'knapsack' in selected:
+        cases += knapsack_cases(QUICK_ITEM_COUNTS if args.quick else ITEM_COUNTS,
+                                QUICK_CAPACITIES if args.quick else CAPACITIES, args.seed)
+        cases += heavy_knapsack_cases(QUICK_HEAVY_ITEM_COUNTS if args.quick else HEAVY_ITEM_COUNTS,
+                                      args.seed)
+    
+    results = []
+    for benchmark, function, params, setup, run in cases:
+        measurements = measure(setup, run, args.repeat)
+        results.append(dict(benchmark=benchmark, function=function, params=params, **measurements))
+        print(f"{function:<26} {params}: {measurements['wall_time_s']['median'] * 1000:10.2f} ms, "
+              f"peak {measurements['peak_memory_bytes'] / 1024:10.1f} KiB")
+    
+    report = {
+        'meta': {
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'commit': git_commit(),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'seed': args.seed,
+            'repeat': args.repeat,
+            'quick': args.quick,
+        },
+        'results': results,
+    }
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote {len(results)} results to {args.output}")
+    
+    if args.compare:
+        regressions = compare(results, args.compare, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} case(s) slower than {args.threshold}x the baseline")
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
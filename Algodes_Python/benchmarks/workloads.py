@@ -0,0 +1,112 @@
+"""
+Seeded workload generators for the benchmarks.
+Inputs are built from the same per-type defaults the games use, so the
+benchmarks measure the kind of data the visualizations produce.
+"""
+
+import os
+import random
+import sys
+
+# Make the game modules importable the way each game imports them
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for game in ('treasure_hunt', 'delivery_rush', 'dungeon_loot'):
+    sys.path.append(os.path.join(ROOT, game))
+
+from closest_pair import Point
+from scheduler import Task, TaskType, get_default_processing_time, get_default_deadline_range
+from knapsack import Item, ItemType, get_default_stats
+
+# Treasure Hunt play area
+MAP_WIDTH = 774
+MAP_HEIGHT = 768
+
+def make_points(n, seed):
+    """
+    Generate treasure points spread uniformly over the map.
+    
+    Args:
+        n (int): Number of points
+        seed (int): Random seed
+    
+    Returns:
+        list: Points with float coordinates
+    """
+    rng = random.Random(seed)
+    return [Point(rng.uniform(0, MAP_WIDTH), rng.uniform(0, MAP_HEIGHT)) for _ in range(n)]
+
+def make_tasks(n, seed):
+    """
+    Generate delivery tasks of random types.
+    
+    Processing times are the per-type defaults and deadlines are drawn from
+    the per-type default ranges, stretched so that the schedule stays
+    reasonably feasible as n grows.
+    
+    Args:
+        n (int): Number of tasks
+        seed (int): Random seed
+    
+    Returns:
+        list: Tasks
+    """
+    rng = random.Random(seed)
+    task_types = list(TaskType)
+    stretch = max(1, n // 10)
+    tasks = []
+    for i in range(n):
+        task_type = rng.choice(task_types)
+        deadline_min, deadline_max = get_default_deadline_range(task_type)
+        tasks.append(Task(
+            name=f"Task {i + 1}",
+            processing_time=get_default_processing_time(task_type),
+            deadline=rng.randint(deadline_min, deadline_max * stretch),
+            task_type=task_type
+        ))
+    return tasks
+
+def make_items(n, seed):
+    """
+    Generate loot items of random types, varied like the game's random items.
+    
+    Args:
+        n (int): Number of items
+        seed (int): Random seed
+    
+    Returns:
+        list: Items
+    """
+    rng = random.Random(seed)
+    item_types = list(ItemType)
+    items = []
+    for i in range(n):
+        item_type = rng.choice(item_types)
+        weight, value = get_default_stats(item_type)
+        items.append(Item(
+            name=f"Item {i + 1}",
+            weight=max(1, weight + rng.randint(-1, 1)),
+            value=max(1, value + rng.randint(-2, 2)),
+            item_type=item_type
+        ))
+    return items
+
+def make_heavy_items(n, seed):
+    """
+    Generate items with weights in the millions, for capacities far too
+    large for a weight-indexed table.
+    
+    Args:
+        n (int): Number of items
+        seed (int): Random seed
+    
+    Returns:
+        list: Items
+    """
+    rng = random.Random(seed)
+    item_types = list(ItemType)
+    return [Item(
+        name=f"Heavy Item {i + 1}",
+        weight=rng.randint(10 ** 6, 10 ** 8),
+        value=rng.randint(1, 10 ** 6),
+        item_type=rng.choice(item_types)
+    ) for i in range(n)]
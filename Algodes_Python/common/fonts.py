@@ -0,0 +1,30 @@
+"""
+Shared font registry, so fonts are loaded from disk once rather than on
+every draw call.
+"""
+
+import pygame
+
+_fonts = {}  # (face, size) -> pygame.font.Font
+
+def get_font(size, face=None):
+    """
+    Get a font, loading it on first use.
+    
+    Args:
+        size (int): Font size
+        face (str, optional): Path to a font file, or None for the default font
+        
+    Returns:
+        pygame.font.Font: The shared font object
+    """
+    key = (face, size)
+    font = _fonts.get(key)
+    if font is None:
+        font = pygame.font.Font(face, size)
+        _fonts[key] = font
+    return font
+
+def clear_font_cache():
+    """Drop all cached fonts. Must be called when pygame's font module shuts down."""
+    _fonts.clear()
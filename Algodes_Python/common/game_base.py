@@ -1,7 +1,14 @@
+import os
+
 import pygame
 import pygame_gui
 from abc import ABC, abstractmethod
 
+from common.fonts import clear_font_cache
+from common.profiler import FrameProfiler
+from common.text_cache import render_text, text_cache
+from common.viz_utils import tooltip_cache
+
 class GameBase(ABC):
     """
     Base class for all algorithm visualization games.
@@ -9,7 +16,7 @@ class GameBase(ABC):
     and visualization components.
     """
     
-    def __init__(self, title, width=1024, height=768):
+    def __init__(self, title, width=1024, height=768, headless=False):
         """
         Initialize the game window and basic components.
         
@@ -17,12 +24,24 @@ class GameBase(ABC):
             title (str): Window title
             width (int): Window width in pixels
             height (int): Window height in pixels
+            headless (bool): Render to an off-screen surface without opening
+                a window, advancing a fixed virtual clock as fast as possible
         """
+        self.headless = headless
+        if headless:
+            # Must be chosen before the display module starts
+            os.environ['SDL_VIDEODRIVER'] = 'dummy'
+        
         pygame.init()
         self.width = width
         self.height = height
-        self.screen = pygame.display.set_mode((width, height))
-        pygame.display.set_caption(title)
+        if headless:
+            # A display mode is still needed for pixel format conversions
+            pygame.display.set_mode((1, 1))
+            self.screen = pygame.Surface((width, height))
+        else:
+            self.screen = pygame.display.set_mode((width, height))
+            pygame.display.set_caption(title)
         
         # Initialize UI manager for better UI elements
         self.ui_manager = pygame_gui.UIManager((width, height))
@@ -30,6 +49,8 @@ class GameBase(ABC):
         # Clock for controlling frame rate
         self.clock = pygame.time.Clock()
         self.fps = 60
+        self.frame_count = 0
+        self.virtual_time = 0.0  # Seconds of game time simulated in headless mode
         
         # Colors
         self.BLACK = (0, 0, 0)
@@ -43,30 +64,223 @@ class GameBase(ABC):
         self.running = True
         self.paused = False
         
-    def run(self):
-        """Main game loop."""
-        while self.running:
-            time_delta = self.clock.tick(self.fps)/1000.0
+        # Dirty-rectangle rendering (opt-in): only regions passed to
+        # mark_dirty, and UI elements that changed, are redrawn, and idle
+        # frames block on events
+        self.dirty_rects_enabled = False
+        self.idle_timeout_ms = 250  # Longest idle wait, keeps UI timers alive
+        self._dirty_rects = []
+        self._full_redraw = True
+        self._ui_images = {}  # UI sprite -> (image, rect) as last drawn
+        
+        # Frame profiler: F3 toggles the overlay, F4 exports a trace and
+        # shows its file name in the overlay
+        self.title = title
+        self.profiler = FrameProfiler(title)
+        self.show_profiler = False
+        self.profiler_position = (10, 10)
+        self._profiler_rect = None
+        
+    def run(self, max_frames=None):
+        """
+        Main game loop.
+        
+        Args:
+            max_frames (int, optional): Stop after this many frames
+        """
+        while self.running and (max_frames is None or self.frame_count < max_frames):
+            self.step()
+        self.close()
+    
+    def step(self):
+        """
+        Run one frame: handle events, update and draw.
+        
+        In headless mode the frame is not throttled and game time advances
+        by exactly 1 / fps, so runs are reproducible.
+        """
+        events = []
+        if self.headless:
+            time_delta = 1.0 / self.fps
+            self.virtual_time += time_delta
+        else:
+            if self.dirty_rects_enabled and not self._needs_frame():
+                # Nothing to animate or redraw: sleep until something happens,
+                # and handle the event that woke us first
+                event = pygame.event.wait(self.idle_timeout_ms)
+                if event.type != pygame.NOEVENT:
+                    events.append(event)
             
-            # Handle events
-            for event in pygame.event.get():
+            time_delta = self.clock.tick(self.fps)/1000.0
+        self.frame_count += 1
+        self.profiler.begin_frame()
+        
+        # Handle events
+        with self.profiler.phase('handle_event'):
+            events += pygame.event.get()
+            for event in events:
                 if event.type == pygame.QUIT:
                     self.running = False
+                elif event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                    self.show_profiler = not self.show_profiler
+                    self.mark_dirty()
+                elif event.type == pygame.KEYDOWN and event.key == pygame.K_F4:
+                    self.export_trace()
+                    self.show_profiler = True
+                    self.mark_dirty()
                 
-                self.ui_manager.process_events(event)
+                # Games mark what their own handling changes
+                if self.ui_manager.process_events(event):
+                    for element in self.ui_manager.get_focus_set() or ():
+                        self.mark_dirty(element.rect)
                 self.handle_event(event)
-            
-            # Update game state
+        
+        # Update game state
+        with self.profiler.phase('update'):
             self.ui_manager.update(time_delta)
             self.update(time_delta)
-            
-            # Draw frame
+            if self.dirty_rects_enabled:
+                self._mark_changed_ui()
+        
+        # Draw frame
+        if self.dirty_rects_enabled:
+            self._draw_dirty()
+        else:
+            self._draw_frame()
+            self._present()
+    
+    def close(self):
+        """Release caches and shut pygame down."""
+        self.profiler.end_frame()
+        self._ui_images.clear()
+        text_cache.clear()
+        tooltip_cache.clear()
+        clear_font_cache()
+        pygame.quit()
+    
+    def mark_dirty(self, rect=None):
+        """
+        Report a changed screen region to redraw in dirty-rectangle mode.
+        
+        Args:
+            rect (pygame.Rect, optional): Region to redraw; None redraws the
+                whole screen
+        """
+        if not self.dirty_rects_enabled:
+            return
+        if rect is None:
+            self._full_redraw = True
+        else:
+            self._dirty_rects.append(pygame.Rect(rect))
+    
+    def is_animating(self):
+        """
+        Whether the game needs frames even when nothing was marked dirty.
+        
+        Games override this so dirty-rectangle mode can block on events
+        while no animation is running.
+        """
+        return True
+    
+    def needs_redraw(self, rect):
+        """
+        Whether any part of a region is redrawn this frame. Games use it in
+        draw() to skip work that dirty-rectangle mode would clip away.
+        
+        Args:
+            rect (pygame.Rect): Screen region
+        """
+        return self.screen.get_clip().colliderect(rect)
+    
+    def _mark_changed_ui(self):
+        """Mark UI elements that appeared, moved, vanished or got a new image."""
+        images = {}
+        for sprite in self.ui_manager.get_sprite_group().sprites():
+            if sprite.visible and sprite.image is not None:
+                images[sprite] = (sprite.image, pygame.Rect(sprite.rect))
+        
+        # pygame_gui replaces an element's image whenever its look changes
+        for sprite, (image, rect) in images.items():
+            old = self._ui_images.pop(sprite, None)
+            if old is None or old[0] is not image or old[1] != rect:
+                self.mark_dirty(rect)
+                if old is not None:
+                    self.mark_dirty(old[1])
+        for _, rect in self._ui_images.values():
+            self.mark_dirty(rect)
+        self._ui_images = images
+    
+    def _needs_frame(self):
+        return self._full_redraw or bool(self._dirty_rects) or self.is_animating()
+    
+    def _draw_frame(self):
+        """Draw the game, the UI and the profiler overlay, timing each phase."""
+        with self.profiler.phase('draw'):
             self.screen.fill(self.WHITE)
             self.draw()
+        with self.profiler.phase('draw_ui'):
             self.ui_manager.draw_ui(self.screen)
-            pygame.display.flip()
+        if self.show_profiler:
+            self._profiler_rect = self.profiler.draw_overlay(
+                self.screen, self.profiler_position, 1000 / self.fps
+            )
+    
+    def _present(self, rects=None):
+        """Show the drawn frame in the window, or only the given regions."""
+        if self.headless:
+            return
+        with self.profiler.phase('present'):
+            if rects is None:
+                pygame.display.flip()
+            else:
+                pygame.display.update(rects)
+    
+    def _draw_dirty(self):
+        """Redraw only the regions marked dirty since the last frame."""
+        if self._full_redraw:
+            self._draw_frame()
+            self._present()
+        elif self._dirty_rects:
+            # Keep the overlay's numbers current whenever a frame is drawn
+            rects = self._dirty_rects
+            if self.show_profiler and self._profiler_rect is not None:
+                rects.append(self._profiler_rect)
+            
+            # Draw once, clipped to the area covering every dirty rect
+            self.screen.set_clip(rects[0].unionall(rects[1:]))
+            self._draw_frame()
+            self.screen.set_clip(None)
+            self._present(rects)
         
-        pygame.quit()
+        self._full_redraw = False
+        self._dirty_rects = []
+    
+    def save_screenshot(self, path):
+        """
+        Save the current frame as an image, e.g. for regression screenshots.
+        
+        Args:
+            path (str): Image file to write; the format follows the extension
+        """
+        pygame.image.save(self.screen, path)
+    
+    def export_trace(self, path=None):
+        """
+        Export the recent frame timings as a Chrome trace event file, which
+        chrome://tracing and Perfetto can open.
+        
+        Args:
+            path (str, optional): File to write; defaults to one named after
+                the game in the working directory
+            
+        Returns:
+            str: Path of the written file
+        """
+        if path is None:
+            game_name = self.title.split(' - ')[0]
+            path = '_'.join(game_name.lower().split()) + '_trace.json'
+        self.profiler.export_trace(path)
+        return path
     
     @abstractmethod
     def handle_event(self, event):
@@ -93,9 +307,10 @@ class GameBase(ABC):
         """Draw game elements on the screen."""
         pass
     
-    def draw_text(self, text, position, color=None, size=32, centered=True):
+    def draw_text(self, text, position, color=None, size=32, centered=True, face=None,
+                  surface=None):
         """
-        Draw text on the screen.
+        Draw text on the screen, or on another surface such as a cached layer.
         
         Args:
             text (str): Text to draw
@@ -103,19 +318,21 @@ class GameBase(ABC):
             color (tuple): RGB color tuple
             size (int): Font size
             centered (bool): Whether to center the text at the position
+            face (str, optional): Font file path, or None for the default font
+            surface (pygame.Surface, optional): Surface to draw on instead
+                of the screen
         """
         if color is None:
             color = self.BLACK
             
-        font = pygame.font.Font(None, size)
-        text_surface = font.render(text, True, color)
+        text_surface = render_text(text, size, color, True, face)
         
         if centered:
             text_rect = text_surface.get_rect(center=position)
         else:
             text_rect = text_surface.get_rect(topleft=position)
             
-        self.screen.blit(text_surface, text_rect)
+        (surface or self.screen).blit(text_surface, text_rect)
     
     def create_button(self, text, rect, callback=None):
         """
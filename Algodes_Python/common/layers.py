@@ -0,0 +1,88 @@
+"""
+Cached background layers.
+Static parts of a scene (grids, axes, table chrome) are rendered once onto
+their own surfaces and composited onto the screen with a single blits call.
+"""
+
+import pygame
+
+class LayerCompositor:
+    """
+    Ordered set of pre-rendered layers.
+    
+    Layers are declared every frame with a key describing the data they
+    show; a layer is only re-rendered when its key or rect changes, or after
+    invalidate() is called.
+    """
+    
+    def __init__(self):
+        # name -> [rect, key, surface], composited in declaration order
+        self._layers = {}
+        self.renders = 0
+    
+    def __len__(self):
+        return len(self._layers)
+    
+    def __contains__(self, name):
+        return name in self._layers
+    
+    def layer(self, name, rect, render, key=None, background=None):
+        """
+        Declare a layer, rendering it if it is new or out of date.
+        
+        Args:
+            name (str): Layer name
+            rect (pygame.Rect): Screen area covered by the layer
+            render (callable): Called as render(surface) to draw the layer,
+                in coordinates relative to rect's top-left corner
+            key (hashable, optional): Anything the layer contents depend on
+            background (tuple, optional): Opaque fill color; None renders
+                onto a transparent surface
+        """
+        rect = pygame.Rect(rect)
+        entry = self._layers.get(name)
+        if entry is not None and entry[0] == rect and entry[1] == key and entry[2] is not None:
+            return
+        
+        if background is None:
+            surface = pygame.Surface(rect.size, pygame.SRCALPHA)
+        else:
+            surface = pygame.Surface(rect.size)
+            surface.fill(background)
+        render(surface)
+        self.renders += 1
+        
+        if entry is None:
+            self._layers[name] = [rect, key, surface]
+        else:
+            entry[:] = [rect, key, surface]
+    
+    def invalidate(self, name=None):
+        """
+        Force a layer to be re-rendered the next time it is declared.
+        
+        Args:
+            name (str, optional): Layer to invalidate; None invalidates all
+        """
+        entries = self._layers.values() if name is None else [self._layers[name]]
+        for entry in entries:
+            entry[2] = None
+    
+    def remove(self, name):
+        """Stop compositing a layer. Unknown names are ignored."""
+        self._layers.pop(name, None)
+    
+    def draw(self, surface, names=None):
+        """
+        Composite layers onto a surface in one blits call.
+        
+        Args:
+            surface: Pygame surface to draw on
+            names (iterable, optional): Layers to draw; None draws all
+        """
+        if names is None:
+            entries = self._layers.values()
+        else:
+            entries = [self._layers[name] for name in names if name in self._layers]
+        surface.blits([(entry[2], entry[0].topleft) for entry in entries
+                       if entry[2] is not None], False)
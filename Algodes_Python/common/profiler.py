@@ -0,0 +1,188 @@
+"""
+Per-frame timing of the game loop phases.
+Keeps rolling percentiles for an on-screen overlay and a bounded trace that
+can be exported in the Chrome trace event format (chrome://tracing, Perfetto).
+"""
+
+import json
+import os
+import time
+from collections import deque
+from contextlib import contextmanager
+
+import pygame
+
+from common.fonts import get_font
+from common.viz_utils import draw_progress_bar
+
+# Phases of a frame, in the order the game loop runs them
+PHASES = ('handle_event', 'update', 'draw', 'draw_ui', 'present')
+
+OVERLAY_REFRESH_S = 0.25  # Statistics change too fast to read every frame
+OVERLAY_ROW_HEIGHT = 18
+OVERLAY_SIZE = (300, OVERLAY_ROW_HEIGHT * (len(PHASES) + 3) + 8)
+
+def percentile(values, q):
+    """
+    Nearest-rank percentile of a sequence.
+    
+    Args:
+        values (iterable): Samples
+        q (float): Percentile between 0 and 100
+    
+    Returns:
+        float: The percentile, or 0.0 without samples
+    """
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    rank = max(0, min(len(ordered) - 1, round(q / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+class FrameProfiler:
+    """
+    Times the phases of each frame.
+    
+    Durations of the last `window` frames feed the rolling percentiles, and
+    the last `trace_frames` frames are kept as trace events.
+    """
+    
+    def __init__(self, name, window=240, trace_frames=3600):
+        """
+        Args:
+            name (str): Name shown for this game in exported traces
+            window (int): Frames used for the rolling percentiles
+            trace_frames (int): Frames kept for trace export
+        """
+        self.name = name
+        self.frame_count = 0
+        self._samples = {phase: deque(maxlen=window) for phase in PHASES}
+        self._frame_samples = deque(maxlen=window)
+        self._trace = deque(maxlen=trace_frames)  # (frame, start, [(phase, start, end)])
+        self._frame_start = None
+        self._frame_phases = []
+        self._origin = time.perf_counter()
+        self._overlay = None
+        self._overlay_time = 0.0
+        self.last_trace_path = None  # Shown in the overlay after an export
+    
+    def begin_frame(self):
+        """Start timing a new frame, closing the previous one."""
+        self.end_frame()
+        self._frame_start = time.perf_counter()
+        self._frame_phases = []
+    
+    def end_frame(self):
+        """Record the frame being timed, if any."""
+        if self._frame_start is None:
+            return
+        totals = dict.fromkeys(PHASES, 0.0)
+        for phase, start, end in self._frame_phases:
+            totals[phase] += end - start
+        for phase, duration in totals.items():
+            self._samples[phase].append(duration * 1000)
+        self._frame_samples.append(sum(totals.values()) * 1000)
+        self._trace.append((self.frame_count, self._frame_start, self._frame_phases))
+        self.frame_count += 1
+        self._frame_start = None
+    
+    @contextmanager
+    def phase(self, name):
+        """Time a block of code as one phase of the current frame."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            if self._frame_start is not None:
+                self._frame_phases.append((name, start, time.perf_counter()))
+    
+    def stats(self, phase=None):
+        """
+        Rolling statistics of a phase, or of whole frames.
+        
+        Args:
+            phase (str, optional): One of PHASES; None for the frame total
+        
+        Returns:
+            dict: p50, p95, p99 and max in milliseconds
+        """
+        samples = self._frame_samples if phase is None else self._samples[phase]
+        return {
+            'p50': percentile(samples, 50),
+            'p95': percentile(samples, 95),
+            'p99': percentile(samples, 99),
+            'max': max(samples, default=0.0),
+        }
+    
+    def export_trace(self, path):
+        """
+        Write the recorded frames as a Chrome trace event JSON file.
+        
+        Args:
+            path (str): File to write
+        """
+        def micros(seconds):
+            return round(seconds * 1e6, 1)
+        
+        events = [{'name': 'process_name', 'ph': 'M', 'pid': 1, 'args': {'name': self.name}}]
+        for frame, frame_start, phases in self._trace:
+            if phases:
+                events.append({
+                    'name': 'frame', 'cat': 'frame', 'ph': 'X', 'pid': 1, 'tid': 1,
+                    'ts': micros(frame_start - self._origin),
+                    'dur': micros(phases[-1][2] - frame_start),
+                    'args': {'frame': frame},
+                })
+            for phase, start, end in phases:
+                events.append({
+                    'name': phase, 'cat': 'phase', 'ph': 'X', 'pid': 1, 'tid': 1,
+                    'ts': micros(start - self._origin), 'dur': micros(end - start),
+                })
+        
+        with open(path, 'w') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+        self.last_trace_path = path
+        self._overlay = None
+    
+    def draw_overlay(self, surface, position, budget_ms):
+        """
+        Draw p50 and p95 times of every phase, with bars showing the p95
+        as a share of the frame budget.
+        
+        Args:
+            surface: Pygame surface to draw on
+            position (tuple): Top-left position (x, y)
+            budget_ms (float): Frame budget in milliseconds, 1000 / fps
+            
+        Returns:
+            pygame.Rect: Area covered by the overlay
+        """
+        now = time.perf_counter()
+        if self._overlay is None or now - self._overlay_time >= OVERLAY_REFRESH_S:
+            self._overlay = self._build_overlay(budget_ms)
+            self._overlay_time = now
+        return surface.blit(self._overlay, position)
+    
+    def _build_overlay(self, budget_ms):
+        overlay = pygame.Surface(OVERLAY_SIZE, pygame.SRCALPHA)
+        overlay.fill((255, 255, 255, 220))
+        pygame.draw.rect(overlay, (0, 0, 0), overlay.get_rect(), 1)
+        
+        # Volatile numbers are rendered directly rather than through the text cache
+        font = get_font(18)
+        overlay.blit(font.render(f"Frame budget {budget_ms:.1f} ms     p50 / p95 ms",
+                                 True, (0, 0, 0)), (6, 4))
+        for row, phase in enumerate(PHASES + (None,), start=1):
+            y = 4 + row * OVERLAY_ROW_HEIGHT
+            stats = self.stats(phase)
+            share = stats['p95'] / budget_ms
+            color = (0, 170, 0) if share < 0.5 else (230, 160, 0) if share < 1 else (220, 0, 0)
+            overlay.blit(font.render(phase or 'frame', True, (0, 0, 0)), (6, y))
+            draw_progress_bar(overlay, (100, y + 2), (100, OVERLAY_ROW_HEIGHT - 6), share, color)
+            overlay.blit(font.render(f"{stats['p50']:.1f} / {stats['p95']:.1f}", True, (0, 0, 0)),
+                         (208, y))
+        if self.last_trace_path is not None:
+            y = 4 + (len(PHASES) + 2) * OVERLAY_ROW_HEIGHT
+            overlay.blit(font.render(f"Trace: {os.path.basename(self.last_trace_path)}",
+                                     True, (0, 0, 0)), (6, y))
+        return overlay
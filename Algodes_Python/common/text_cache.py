@@ -0,0 +1,89 @@
+"""
+Bounded LRU cache of rendered text surfaces, so labels that don't change
+between frames are rendered once and then only blitted.
+"""
+
+from collections import OrderedDict
+
+from common.fonts import get_font
+
+class TextSurfaceCache:
+    """
+    LRU cache of surfaces keyed by whatever determines their pixels.
+    
+    Cached surfaces are shared between callers and must be treated as
+    read-only.
+    """
+    
+    def __init__(self, max_size=2048):
+        """
+        Args:
+            max_size (int): Maximum number of surfaces kept
+        """
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._surfaces = OrderedDict()
+    
+    def __len__(self):
+        return len(self._surfaces)
+    
+    @property
+    def hit_rate(self):
+        """Fraction of lookups served from the cache."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+    
+    def get(self, key, create):
+        """
+        Get the surface for a key, calling create() to make it on a miss.
+        
+        Args:
+            key (tuple): Hashable description of the surface
+            create (callable): Builds the surface when it is not cached
+            
+        Returns:
+            pygame.Surface: The cached surface
+        """
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self._surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+        
+        self.misses += 1
+        surface = create()
+        self._surfaces[key] = surface
+        if len(self._surfaces) > self.max_size:
+            self._surfaces.popitem(last=False)
+        return surface
+    
+    def render(self, text, size, color, antialias=True, face=None):
+        """
+        Get the rendered surface for a piece of text.
+        
+        Args:
+            text (str): Text to render
+            size (int): Font size
+            color (tuple): RGB color tuple
+            antialias (bool): Whether to antialias the text
+            face (str, optional): Font file path, or None for the default font
+            
+        Returns:
+            pygame.Surface: The rendered text
+        """
+        key = (text, size, tuple(color), antialias, face)
+        return self.get(key, lambda: get_font(size, face).render(text, antialias, color))
+    
+    def clear(self):
+        """Drop all cached surfaces and reset the counters."""
+        self._surfaces.clear()
+        self.hits = 0
+        self.misses = 0
+
+# Shared cache used by GameBase.draw_text and the viz_utils helpers
+text_cache = TextSurfaceCache()
+
+def render_text(text, size, color, antialias=True, face=None):
+    """Render text through the shared cache. See TextSurfaceCache.render."""
+    return text_cache.render(text, size, color, antialias, face)
@@ -1,6 +1,13 @@
 import pygame
 import math
 
+from common.fonts import get_font
+from common.text_cache import TextSurfaceCache
+
+# Tooltips often show text that changes every step, so they get their own
+# small cache rather than pushing labels out of the shared text cache
+tooltip_cache = TextSurfaceCache(max_size=64)
+
 def draw_arrow(surface, start_pos, end_pos, color, width=2, arrow_size=10):
     """
     Draw an arrow from start_pos to end_pos.
@@ -61,22 +68,34 @@ def draw_dashed_line(surface, start_pos, end_pos, color, width=1, dash_length=10
         )
         pygame.draw.line(surface, color, start, end, width)
 
-def create_tooltip(text, font_size=20, padding=5, bg_color=(255, 255, 220), text_color=(0, 0, 0)):
+def create_tooltip(text, font_size=20, padding=5, bg_color=(255, 255, 220), text_color=(0, 0, 0),
+                   font_face=None):
     """
     Create a tooltip surface with text.
     
+    Tooltips are cached in tooltip_cache, so the returned surface is shared
+    and must not be drawn on.
+    
     Args:
         text (str): Tooltip text
         font_size (int): Font size
         padding (int): Padding around text
         bg_color (tuple): RGB color tuple for background
         text_color (tuple): RGB color tuple for text
+        font_face (str, optional): Font file path, or None for the default font
         
     Returns:
         surface: Pygame surface containing the tooltip
     """
-    font = pygame.font.Font(None, font_size)
-    text_surface = font.render(text, True, text_color)
+    key = ('tooltip', text, font_size, padding, tuple(bg_color), tuple(text_color), font_face)
+    return tooltip_cache.get(
+        key,
+        lambda: _build_tooltip(text, font_size, padding, bg_color, text_color, font_face)
+    )
+
+def _build_tooltip(text, font_size, padding, bg_color, text_color, font_face):
+    """Render a tooltip surface; see create_tooltip."""
+    text_surface = get_font(font_size, font_face).render(text, True, text_color)
     
     # Create surface with padding
     width = text_surface.get_width() + 2 * padding
@@ -138,4 +157,4 @@ def draw_grid(surface, cell_size, color=(200, 200, 200)):
     
     # Draw horizontal lines
     for y in range(0, height, cell_size):
-        pygame.draw.line(surface, color, (0, y), (width, y)) 
\ No newline at end of file
+        pygame.draw.line(surface, color, (0, y), (width, y))
\ No newline at end of file
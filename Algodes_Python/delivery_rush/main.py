@@ -3,6 +3,7 @@ Main game file for the Delivery Rush - Minimizing Lateness visualization.
 Handles game initialization, rendering, and user interaction.
 """
 
+import math
 import os
 import sys
 import random
@@ -13,12 +14,14 @@ import pygame_gui
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from common.game_base import GameBase
+from common.layers import LayerCompositor
 from common.viz_utils import create_tooltip
 from scheduler import (
-    Task, TaskType, VisualizationState, schedule_tasks,
+    Task, TaskType, VisualizationState, schedule_steps, schedule_parallel_steps,
     get_task_color, get_default_processing_time,
     get_default_deadline_range
 )
+from schedule_view import ScheduleIndex, TimelineView, TaskListView
 
 class TaskCreationDialog:
     def __init__(self, ui_manager, window_size, task_type):
@@ -91,27 +94,52 @@ class TaskCreationDialog:
         self.deadline_entry.set_text(str(deadline_min))
 
 class DeliveryRushGame(GameBase):
-    def __init__(self):
-        super().__init__("Delivery Rush - Minimizing Lateness Algorithm")
+    def __init__(self, headless=False):
+        super().__init__("Delivery Rush - Minimizing Lateness Algorithm", headless=headless)
         
         # Game state
         self.tasks = []  # List of delivery tasks
         self.viz_state = VisualizationState()
         self.algorithm_running = False
+        self.algorithm_steps = None  # Step generator of the running algorithm
         self.visualization_speed = 1.0
         self.step_timer = 0
         self.task_creation_dialog = None
+        self.couriers = 1  # Number of couriers, one timeline lane each
+        self.max_deadline = 0  # Latest deadline among self.tasks
         
         # Visual settings
-        self.timeline_height = 400
+        self.timeline_height = 340
         self.timeline_y = 100
         self.task_height = 40
         self.pixels_per_time_unit = 10
         self.task_list_rect = pygame.Rect(50, 450, self.width - 400, 250)
+        self.timeline_area = pygame.Rect(  # Timeline with its time markers
+            0, self.timeline_y - 35,
+            self.width - 300, self.timeline_height + 35
+        )
+        
+        # Scrollable views that only draw the rows in sight
+        self.timeline_view = TimelineView(
+            pygame.Rect(50, self.timeline_y, self.width - 400, self.timeline_height),
+            self.pixels_per_time_unit,
+            self.task_height + 10
+        )
+        self.task_list_view = TaskListView(
+            self.task_list_rect.inflate(-20, -60).move(0, 20)
+        )
+        self.schedule_index = ScheduleIndex()  # Scheduled tasks by timeline row
         
         # Create UI elements
         self.setup_ui()
         
+        # Only redraw what the algorithm steps and input change
+        self.dirty_rects_enabled = True
+        self.play_area = pygame.Rect(0, 0, self.width - 300, self.height)
+        
+        # Pre-rendered static scenery
+        self.background = LayerCompositor()
+        
         # Tutorial state
         self.show_tutorial = True
         self.tutorial_step = 0
@@ -196,11 +224,36 @@ class DeliveryRushGame(GameBase):
             manager=self.ui_manager
         )
         
+        # Courier count slider
+        self.courier_slider = pygame_gui.elements.UIHorizontalSlider(
+            relative_rect=pygame.Rect(
+                self.width - 275,
+                6 * spacing + 5 * button_height,
+                button_width,
+                button_height
+            ),
+            start_value=1,
+            value_range=(1, 8),
+            manager=self.ui_manager
+        )
+        
+        # Courier count label
+        self.courier_label = pygame_gui.elements.UILabel(
+            relative_rect=pygame.Rect(
+                self.width - 275,
+                7 * spacing + 6 * button_height,
+                button_width,
+                button_height // 2
+            ),
+            text="Couriers: 1",
+            manager=self.ui_manager
+        )
+        
         # Stats panel
         self.stats_panel = pygame_gui.elements.UIPanel(
             relative_rect=pygame.Rect(
                 self.width - 275,
-                6 * spacing + 5 * button_height,
+                8 * spacing + 7 * button_height,
                 button_width,
                 150
             ),
@@ -211,7 +264,7 @@ class DeliveryRushGame(GameBase):
         self.tasks_label = pygame_gui.elements.UILabel(
             relative_rect=pygame.Rect(
                 self.width - 265,
-                7 * spacing + 5 * button_height,
+                9 * spacing + 7 * button_height,
                 button_width - 20,
                 25
             ),
@@ -222,7 +275,7 @@ class DeliveryRushGame(GameBase):
         self.lateness_label = pygame_gui.elements.UILabel(
             relative_rect=pygame.Rect(
                 self.width - 265,
-                8 * spacing + 5 * button_height + 25,
+                10 * spacing + 7 * button_height + 25,
                 button_width - 20,
                 25
             ),
@@ -232,7 +285,13 @@ class DeliveryRushGame(GameBase):
     
     def handle_event(self, event):
         """Handle game-specific events."""
-        if event.type == pygame_gui.UI_BUTTON_PRESSED:
+        if event.type == pygame.MOUSEWHEEL:
+            if self.timeline_view.handle_event(event):
+                self.mark_dirty(self.timeline_area)
+            elif self.task_list_view.handle_event(event):
+                self.mark_dirty(self.task_list_rect)
+        
+        elif event.type == pygame_gui.UI_BUTTON_PRESSED:
             if event.ui_element == self.start_button:
                 self.toggle_algorithm()
             elif event.ui_element == self.reset_button:
@@ -251,6 +310,27 @@ class DeliveryRushGame(GameBase):
                 self.visualization_speed = min(2.0, self.visualization_speed + 0.1)
             elif event.key == pygame.K_MINUS:
                 self.visualization_speed = max(0.1, self.visualization_speed - 0.1)
+            elif event.key == pygame.K_UP:
+                self.timeline_view.scroll(rows=-1)
+                self.mark_dirty(self.timeline_area)
+            elif event.key == pygame.K_DOWN:
+                self.timeline_view.scroll(rows=1)
+                self.mark_dirty(self.timeline_area)
+            elif event.key == pygame.K_LEFT:
+                self.timeline_view.scroll(time=-self.timeline_view.marker_step())
+                self.mark_dirty(self.timeline_area)
+            elif event.key == pygame.K_RIGHT:
+                self.timeline_view.scroll(time=self.timeline_view.marker_step())
+                self.mark_dirty(self.timeline_area)
+            elif event.key == pygame.K_PAGEUP:
+                self.task_list_view.scroll(-4)
+                self.mark_dirty(self.task_list_rect)
+            elif event.key == pygame.K_PAGEDOWN:
+                self.task_list_view.scroll(4)
+                self.mark_dirty(self.task_list_rect)
+            elif event.key == pygame.K_HOME:
+                self.timeline_view.fit()
+                self.mark_dirty(self.timeline_area)
         
         elif event.type == pygame_gui.UI_WINDOW_CLOSE:
             if self.task_creation_dialog and event.ui_element == self.task_creation_dialog.window:
@@ -259,6 +339,9 @@ class DeliveryRushGame(GameBase):
         elif event.type == pygame_gui.UI_HORIZONTAL_SLIDER_MOVED:
             if event.ui_element == self.speed_slider:
                 self.visualization_speed = event.value
+            elif event.ui_element == self.courier_slider:
+                self.couriers = int(event.value)
+                self.courier_label.set_text(f"Couriers: {self.couriers}")
     
     def show_task_creation_dialog(self):
         """Show dialog for creating a new task."""
@@ -285,8 +368,7 @@ class DeliveryRushGame(GameBase):
                 task_type=TaskType.REGULAR  # All tasks are regular type
             )
             
-            self.tasks.append(task)
-            self.tasks_label.set_text(f"Tasks: {len(self.tasks)}")
+            self.add_task(task)
             
             # Close the dialog
             self.task_creation_dialog.window.kill()
@@ -317,8 +399,15 @@ class DeliveryRushGame(GameBase):
             task_type=task_type
         )
         
+        self.add_task(task)
+    
+    def add_task(self, task):
+        """Add a task to the list."""
         self.tasks.append(task)
+        self.max_deadline = max(self.max_deadline, task.deadline)
         self.tasks_label.set_text(f"Tasks: {len(self.tasks)}")
+        self.mark_dirty(self.timeline_area)  # The time scale may grow
+        self.mark_dirty(self.task_list_rect)
     
     def update(self, time_delta):
         """Update game state."""
@@ -334,31 +423,44 @@ class DeliveryRushGame(GameBase):
     
     def draw(self):
         """Draw game elements."""
-        # Draw timeline background
-        timeline_rect = pygame.Rect(
-            50, self.timeline_y,
-            self.width - 400, self.timeline_height
+        viz_state = self.viz_state
+        timeline = self.timeline_view
+        self.schedule_index.sync(viz_state.scheduled_tasks, self.task_row)
+        rows = viz_state.couriers if viz_state.couriers > 1 else len(viz_state.scheduled_tasks)
+        timeline.set_extent(rows, max(self.max_deadline, self.schedule_index.end_time) + 30)
+        
+        # Keep the task being scheduled in view while the algorithm runs
+        current_index = viz_state.current_index
+        if self.algorithm_running and current_index is not None:
+            _, start, end = viz_state.scheduled_tasks[current_index]
+            timeline.ensure_visible(self.schedule_index.row_of[current_index], start, end)
+        
+        # Draw timeline frame, time markers and task list frame; these are
+        # pre-rendered and only redrawn when the view or the lanes change
+        timeline_area = self.timeline_area
+        first_row, end_row = timeline.visible_rows()
+        self.background.layer(
+            'timeline', timeline_area,
+            lambda surface: self.render_timeline(surface, timeline_area.topleft),
+            key=(timeline.scroll_time, timeline.pixels_per_time_unit,
+                 timeline.scroll_row, viz_state.couriers)
         )
-        pygame.draw.rect(self.screen, self.WHITE, timeline_rect)
-        pygame.draw.rect(self.screen, self.BLACK, timeline_rect, 2)
-        
-        # Draw task list background
-        pygame.draw.rect(self.screen, self.WHITE, self.task_list_rect)
-        pygame.draw.rect(self.screen, self.BLACK, self.task_list_rect, 2)
-        
-        # Draw task list title
-        self.draw_text(
-            "Task List",
-            (self.task_list_rect.centerx, self.task_list_rect.y + 20),
-            size=24
-        )
-        
-        # Draw tasks in list
-        y = self.task_list_rect.y + 50
-        for task in self.tasks:
-            color = get_task_color(task.task_type)
-            pygame.draw.rect(self.screen, color,
-                           (self.task_list_rect.x + 10, y, 
+        self.background.layer('task_list', self.task_list_rect, self.render_task_list_frame)
+        self.background.draw(self.screen)
+        
+        previous_clip = self.screen.get_clip()
+        
+        # Draw the visible tasks in the list
+        self.task_list_view.set_rows(len(self.tasks))
+        self.screen.set_clip(self.task_list_view.rect.clip(previous_clip))
+        first, end = self.task_list_view.visible_rows()
+        if not self.needs_redraw(self.task_list_view.rect):
+            end = first  # Nothing of the list is redrawn this frame
+        for index in range(first, end):
+            task = self.tasks[index]
+            y = self.task_list_view.row_y(index)
+            pygame.draw.rect(self.screen, get_task_color(task.task_type),
+                           (self.task_list_rect.x + 10, y,
                             self.task_list_rect.width - 20, 30))
             
             self.draw_text(
@@ -367,39 +469,16 @@ class DeliveryRushGame(GameBase):
                 color=self.BLACK,
                 size=20
             )
-            
-            y += 40
-        
-        # Draw time markers
-        max_time = max(
-            (task.deadline for task in self.tasks),
-            default=120
-        )
         
-        for t in range(0, max_time + 30, 10):
-            x = 50 + t * self.pixels_per_time_unit
-            if x < self.width - 400:
-                pygame.draw.line(
-                    self.screen, self.GRAY,
-                    (x, self.timeline_y),
-                    (x, self.timeline_y + self.timeline_height)
-                )
-                self.draw_text(
-                    str(t),
-                    (x, self.timeline_y - 20),
-                    size=20
-                )
-        
-        # Draw scheduled tasks
-        y_offset = self.timeline_y + 10
-        for task, start, end in self.viz_state.scheduled_tasks:
-            # Task rectangle
-            task_rect = pygame.Rect(
-                50 + start * self.pixels_per_time_unit,
-                y_offset,
-                (end - start) * self.pixels_per_time_unit,
-                self.task_height
-            )
+        # Draw the scheduled tasks in view
+        self.screen.set_clip(timeline.rect.clip(previous_clip))
+        start_time, end_time = timeline.visible_times()
+        visible = ()
+        if self.needs_redraw(timeline.rect):
+            visible = self.schedule_index.visible(first_row, end_row, start_time, end_time)
+        for index in visible:
+            task, start, end = viz_state.scheduled_tasks[index]
+            task_rect = self.timeline_task_rect(index, start, end)
             pygame.draw.rect(self.screen, get_task_color(task.task_type), task_rect)
             pygame.draw.rect(self.screen, self.BLACK, task_rect, 2)
             
@@ -412,32 +491,25 @@ class DeliveryRushGame(GameBase):
             )
             
             # Deadline marker
-            deadline_x = 50 + task.deadline * self.pixels_per_time_unit
-            if deadline_x < self.width - 400:
-                pygame.draw.line(
-                    self.screen, self.RED,
-                    (deadline_x, y_offset),
-                    (deadline_x, y_offset + self.task_height),
-                    2
-                )
-            
-            y_offset += self.task_height + 10
-        
-        # Draw current task highlight
-        if self.viz_state.current_task:
-            task = self.viz_state.current_task
-            y_offset = self.timeline_y + 10
-            for t, _, _ in self.viz_state.scheduled_tasks:
-                if t == task:
-                    task_rect = pygame.Rect(
-                        50 + self.viz_state.current_time * self.pixels_per_time_unit,
-                        y_offset,
-                        task.processing_time * self.pixels_per_time_unit,
-                        self.task_height
-                    )
-                    pygame.draw.rect(self.screen, self.GREEN, task_rect, 3)
-                    break
-                y_offset += self.task_height + 10
+            deadline_x = timeline.time_to_x(task.deadline)
+            pygame.draw.line(
+                self.screen, self.RED,
+                (deadline_x, task_rect.top),
+                (deadline_x, task_rect.bottom),
+                2
+            )
+        
+        # Draw current task highlight, found by its index in the schedule
+        if viz_state.current_task and current_index is not None:
+            task = viz_state.current_task
+            task_rect = self.timeline_task_rect(
+                current_index,
+                viz_state.current_time,
+                viz_state.current_time + task.processing_time
+            )
+            pygame.draw.rect(self.screen, self.GREEN, task_rect, 3)
+        
+        self.screen.set_clip(previous_clip)
         
         # Draw algorithm completion message
         if self.viz_state.completed and self.viz_state.scheduled_tasks:
@@ -464,6 +536,77 @@ class DeliveryRushGame(GameBase):
                 (10, self.height - tooltip.get_height() - 10)
             )
     
+    def render_timeline(self, surface, origin):
+        """
+        Draw the timeline frame, the time markers in view and courier lane labels.
+        
+        Args:
+            surface: Layer surface to draw on
+            origin (tuple): Screen position of the surface's top-left corner
+        """
+        ox, oy = origin
+        timeline = self.timeline_view
+        timeline_rect = timeline.rect.move(-ox, -oy)
+        pygame.draw.rect(surface, self.WHITE, timeline_rect)
+        pygame.draw.rect(surface, self.BLACK, timeline_rect, 2)
+        
+        # Time markers
+        step = timeline.marker_step()
+        start_time, end_time = timeline.visible_times()
+        for t in range(math.ceil(start_time / step) * step, int(end_time) + 1, step):
+            x = timeline.time_to_x(t) - ox
+            if x < timeline_rect.right:
+                pygame.draw.line(
+                    surface, self.GRAY,
+                    (x, timeline_rect.top),
+                    (x, timeline_rect.bottom)
+                )
+                self.draw_text(
+                    str(t),
+                    (x, timeline_rect.top - 20),
+                    size=20,
+                    surface=surface
+                )
+        
+        # Courier lane labels
+        if self.viz_state.couriers > 1:
+            first_row, end_row = timeline.visible_rows()
+            for courier in range(first_row, end_row):
+                lane_y = timeline.row_y(courier) - oy
+                if lane_y + self.task_height <= timeline_rect.bottom:
+                    self.draw_text(
+                        f"C{courier + 1}",
+                        (25 - ox, lane_y + self.task_height // 2),
+                        size=20,
+                        surface=surface
+                    )
+    
+    def timeline_task_rect(self, index, start, end):
+        """Get the screen rectangle of a scheduled task on the timeline."""
+        timeline = self.timeline_view
+        x = timeline.time_to_x(start)
+        return pygame.Rect(
+            x,
+            timeline.row_y(self.schedule_index.row_of[index]),
+            max(1, timeline.time_to_x(end) - x),
+            self.task_height
+        )
+    
+    def render_task_list_frame(self, surface):
+        """Draw the task list background, border and title onto a layer surface."""
+        frame = surface.get_rect()
+        pygame.draw.rect(surface, self.WHITE, frame)
+        pygame.draw.rect(surface, self.BLACK, frame, 2)
+        self.draw_text("Task List", (frame.centerx, 20), size=24, surface=surface)
+    
+    def task_row(self, index):
+        """Get the timeline row of the index-th scheduled task."""
+        if self.viz_state.couriers > 1:
+            # One lane per courier
+            return self.viz_state.scheduled_couriers[index]
+        # One row per task
+        return index
+    
     def toggle_algorithm(self):
         """Start or stop the algorithm visualization."""
         if len(self.tasks) < 1:
@@ -472,6 +615,14 @@ class DeliveryRushGame(GameBase):
         self.algorithm_running = not self.algorithm_running
         if self.algorithm_running:
             self.viz_state = VisualizationState()
+            self.schedule_index.clear()
+            self.timeline_view.reset()
+            self.mark_dirty(self.play_area)
+            if self.couriers > 1:
+                self.algorithm_steps = schedule_parallel_steps(
+                    list(self.tasks), self.couriers, self.viz_state)
+            else:
+                self.algorithm_steps = schedule_steps(list(self.tasks), self.viz_state)
             self.start_button.set_text("Stop Algorithm")
         else:
             self.start_button.set_text("Start Algorithm")
@@ -479,23 +630,37 @@ class DeliveryRushGame(GameBase):
     def reset_game(self):
         """Reset the game state."""
         self.tasks = []
+        self.max_deadline = 0
         self.viz_state = VisualizationState()
+        self.schedule_index.clear()
+        self.timeline_view.reset()
         self.algorithm_running = False
+        self.algorithm_steps = None
         self.start_button.set_text("Start Algorithm")
         self.tasks_label.set_text("Tasks: 0")
         self.lateness_label.set_text("Max Lateness: -")
+        self.mark_dirty(self.play_area)
     
     def update_algorithm(self):
         """Update algorithm visualization state."""
         if not self.algorithm_running:
             return
             
-        # Run scheduling algorithm
-        schedule_tasks(self.tasks, self.viz_state)
-        
-        if self.viz_state.completed:
+        # Advance the scheduling algorithm by a single step
+        try:
+            next(self.algorithm_steps)
+        except StopIteration:
+            self.mark_dirty(self.play_area)
             self.algorithm_running = False
+            self.algorithm_steps = None
             self.start_button.set_text("Start Algorithm")
+            return
+        
+        self.mark_dirty(self.play_area)
+    
+    def is_animating(self):
+        """Frames are only needed while the algorithm is running."""
+        return self.algorithm_running
 
 if __name__ == "__main__":
     game = DeliveryRushGame()
@@ -0,0 +1,185 @@
+"""
+Online Earliest Deadline First (EDF) scheduling for orders that arrive while
+deliveries are already under way.
+"""
+
+import copy
+import heapq
+import itertools
+from typing import Dict, List, Optional, Tuple
+
+from scheduler import Task
+
+class OnlineScheduler:
+    """
+    Non-preemptive EDF scheduler for a single courier.
+    
+    Tasks wait in a heap keyed by release time until they are released, then
+    move to a heap keyed by deadline. Whenever the courier is free it starts
+    the released task with the earliest deadline. Inserts and cancellations
+    are O(log n); cancelled tasks are skipped lazily when they reach the top
+    of a heap, and the heaps are rebuilt once cancelled entries outnumber
+    pending tasks. The schedule of started tasks and its maximum lateness
+    are kept up to date incrementally; planned() projects the tasks not
+    started yet and keeps the projection until the scheduler changes.
+    """
+    
+    def __init__(self, start_time: int = 0):
+        """
+        Args:
+            start_time: Time at which the courier becomes available
+        """
+        self.current_time = start_time  # Latest time the schedule has been advanced to
+        self.courier_free_at = start_time
+        self.schedule: List[Tuple[Task, int, int]] = []  # (task, start, end) of started tasks
+        self.max_lateness = 0
+        
+        self._pending: Dict[int, Tuple[int, Task]] = {}  # id(task) -> (entry id, task)
+        self._waiting: List[Tuple[int, int, int]] = []  # (release_time, entry id, id(task))
+        self._ready: List[Tuple[int, int, int]] = []  # (deadline, entry id, id(task))
+        self._entry_ids = itertools.count()
+        self._cancelled = 0  # Cancelled entries still in the heaps
+        self._plan: Optional[Tuple[List[Tuple[Task, int, int]], int]] = None  # Cached planned()
+    
+    def __len__(self) -> int:
+        """Number of tasks that have not been started yet."""
+        return len(self._pending)
+    
+    def add(self, task: Task):
+        """Add a new task. Tasks released in the past are available immediately."""
+        key = id(task)
+        if key in self._pending:
+            return
+        
+        entry_id = next(self._entry_ids)
+        self._pending[key] = (entry_id, task)
+        self._plan = None
+        if task.release_time <= self.current_time:
+            heapq.heappush(self._ready, (task.deadline, entry_id, key))
+        else:
+            heapq.heappush(self._waiting, (task.release_time, entry_id, key))
+    
+    def cancel(self, task: Task) -> bool:
+        """
+        Cancel a task that has not been started yet.
+        
+        Returns:
+            True if the task was pending, False otherwise
+        """
+        if self._pending.pop(id(task), None) is None:
+            return False
+        
+        self._plan = None
+        self._cancelled += 1
+        if self._cancelled > len(self._pending):
+            self._compact()
+        return True
+    
+    def peek(self) -> Optional[Task]:
+        """Get the released task that would be started next, if any."""
+        self._release(max(self.courier_free_at, self.current_time))
+        entry = self._top(self._ready)
+        return None if entry is None else self._pending[entry[2]][1]
+    
+    def advance(self, until: Optional[int] = None) -> List[Tuple[Task, int, int]]:
+        """
+        Start every task the courier can begin at or before `until`.
+        
+        Orders arriving by `until` should be added before calling this, since
+        a task started here is never replaced by a more urgent one.
+        
+        Args:
+            until: Current time; None starts all pending tasks
+            
+        Returns:
+            The (task, start_time, end_time) entries added to the schedule
+        """
+        started = []
+        while True:
+            start = max(self.courier_free_at, self.current_time)
+            self._release(start)
+            entry = self._top(self._ready)
+            
+            if entry is None:
+                # Nothing released yet; idle until the next order arrives
+                waiting = self._top(self._waiting)
+                if waiting is None:
+                    break
+                start = max(start, waiting[0])
+                if until is not None and start > until:
+                    break
+                self._release(start)
+                entry = self._top(self._ready)
+            elif until is not None and start > until:
+                break
+            
+            heapq.heappop(self._ready)
+            _, task = self._pending.pop(entry[2])
+            end = start + task.processing_time
+            self.schedule.append((task, start, end))
+            self.max_lateness = max(self.max_lateness, task.lateness(end))
+            self.courier_free_at = end
+            started.append((task, start, end))
+        
+        if until is not None and until > self.current_time:
+            self.current_time = until
+            self._plan = None
+        if started:
+            self._plan = None
+            if self._cancelled > len(self._pending):
+                self._compact()
+        return started
+    
+    def planned(self) -> Tuple[List[Tuple[Task, int, int]], int]:
+        """
+        Project how the pending tasks would run if no more orders arrive.
+        
+        The scheduler itself is left unchanged. The projection costs
+        O(n log n) and is cached until a task is added, cancelled or started
+        or the time advances, so repeated queries between changes only copy
+        the cached entries.
+        
+        Returns:
+            (entries, max_lateness): (task, start_time, end_time) of every
+            pending task in the order advance() would start them, and the
+            maximum lateness of the started and projected tasks together
+        """
+        if self._plan is None:
+            projection = copy.copy(self)
+            projection.schedule = []
+            projection._pending = dict(self._pending)
+            projection._waiting = list(self._waiting)
+            projection._ready = list(self._ready)
+            self._plan = (projection.advance(), projection.max_lateness)
+        entries, max_lateness = self._plan
+        return list(entries), max_lateness
+    
+    def _release(self, time: int):
+        """Move tasks released by `time` from the waiting heap to the ready heap."""
+        while True:
+            entry = self._top(self._waiting)
+            if entry is None or entry[0] > time:
+                return
+            heapq.heappop(self._waiting)
+            _, entry_id, key = entry
+            task = self._pending[key][1]
+            heapq.heappush(self._ready, (task.deadline, entry_id, key))
+    
+    def _top(self, heap: List[Tuple[int, int, int]]) -> Optional[Tuple[int, int, int]]:
+        """Get the first live entry of a heap, dropping cancelled ones."""
+        while heap:
+            entry = heap[0]
+            pending = self._pending.get(entry[2])
+            if pending is not None and pending[0] == entry[1]:
+                return entry
+            heapq.heappop(heap)
+            self._cancelled -= 1
+        return None
+    
+    def _compact(self):
+        """Rebuild both heaps without their cancelled entries."""
+        for heap in (self._waiting, self._ready):
+            heap[:] = [entry for entry in heap
+                       if self._pending.get(entry[2], (None,))[0] == entry[1]]
+            heapq.heapify(heap)
+        self._cancelled = 0
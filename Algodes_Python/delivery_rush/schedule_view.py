@@ -0,0 +1,301 @@
+"""
+Scrollable, zoomable views of the delivery schedule and task list.
+The views only hand out the rows and time range inside their viewport, so
+drawing cost depends on the window size rather than the number of tasks.
+"""
+
+import math
+from bisect import bisect_left, bisect_right
+
+import pygame
+
+MIN_PIXELS_PER_TIME_UNIT = 0.05
+MAX_PIXELS_PER_TIME_UNIT = 80
+ZOOM_STEP = 1.25
+MARKER_SPACING = 100  # Minimum pixels between time markers
+
+class ScheduleIndex:
+    """
+    Row lookup for a schedule that grows one entry at a time.
+    
+    Entries in a row never overlap and are appended in start order, so the
+    entries overlapping a time window are found by bisection.
+    """
+    
+    def __init__(self):
+        self._rows = {}  # row -> ([starts], [ends], [schedule indices])
+        self.row_of = []  # schedule index -> row
+        self.end_time = 0  # Latest end time in the schedule
+    
+    def __len__(self):
+        return len(self.row_of)
+    
+    def clear(self):
+        """Forget all indexed entries."""
+        self._rows.clear()
+        self.row_of = []
+        self.end_time = 0
+    
+    def sync(self, scheduled_tasks, row_of_index):
+        """
+        Index the entries appended to a schedule since the last call.
+        
+        Args:
+            scheduled_tasks (list): (task, start, end) entries
+            row_of_index (callable): Maps a schedule index to its row
+        """
+        if len(scheduled_tasks) < len(self.row_of):
+            # A new schedule replaced the one we indexed
+            self.clear()
+        
+        for index in range(len(self.row_of), len(scheduled_tasks)):
+            _, start, end = scheduled_tasks[index]
+            row = row_of_index(index)
+            starts, ends, indices = self._rows.setdefault(row, ([], [], []))
+            starts.append(start)
+            ends.append(end)
+            indices.append(index)
+            self.row_of.append(row)
+            self.end_time = max(self.end_time, end)
+    
+    def visible(self, first_row, end_row, start_time, end_time):
+        """
+        Find the entries shown in a window of the timeline.
+        
+        Args:
+            first_row (int): First visible row
+            end_row (int): Row after the last visible row
+            start_time (float): Earliest visible time
+            end_time (float): Latest visible time
+        
+        Returns:
+            list: Schedule indices of entries overlapping the window
+        """
+        visible = []
+        for row in range(first_row, end_row):
+            entries = self._rows.get(row)
+            if entries is None:
+                continue
+            starts, ends, indices = entries
+            first = bisect_right(ends, start_time)
+            last = bisect_left(starts, end_time)
+            visible.extend(indices[first:last])
+        return visible
+
+class TimelineView:
+    """
+    Window onto the schedule timeline, scrollable by rows and by time and
+    zoomable along the time axis.
+    """
+    
+    def __init__(self, rect, pixels_per_time_unit=10, row_height=50):
+        """
+        Args:
+            rect (pygame.Rect): Screen area of the timeline
+            pixels_per_time_unit (float): Initial zoom level
+            row_height (int): Height of a row including spacing
+        """
+        self.rect = pygame.Rect(rect)
+        self.default_pixels_per_time_unit = pixels_per_time_unit
+        self.pixels_per_time_unit = pixels_per_time_unit
+        self.row_height = row_height
+        self.scroll_time = 0.0
+        self.scroll_row = 0.0
+        self.rows = 0
+        self.end_time = 0
+    
+    def reset(self):
+        """Return to the default zoom level at time 0 and the first row."""
+        self.pixels_per_time_unit = self.default_pixels_per_time_unit
+        self.scroll_time = 0.0
+        self.scroll_row = 0.0
+    
+    def set_extent(self, rows, end_time):
+        """
+        Set how far the timeline can be scrolled.
+        
+        Args:
+            rows (int): Number of rows
+            end_time (float): Latest time worth showing
+        """
+        self.rows = rows
+        self.end_time = end_time
+        self._clamp()
+    
+    def time_to_x(self, time):
+        """Screen x coordinate of a point in time."""
+        return self.rect.x + round((time - self.scroll_time) * self.pixels_per_time_unit)
+    
+    def row_y(self, row):
+        """Screen y coordinate of the top of a row."""
+        return self.rect.y + 10 + round((row - self.scroll_row) * self.row_height)
+    
+    def visible_rows(self):
+        """
+        Returns:
+            tuple: (first_row, end_row) of the rows in view, end exclusive
+        """
+        first_row = int(self.scroll_row)
+        end_row = min(self.rows, math.ceil(self.scroll_row + (self.rect.height - 10) / self.row_height))
+        return first_row, end_row
+    
+    def visible_times(self):
+        """
+        Returns:
+            tuple: (start_time, end_time) of the time range in view
+        """
+        return self.scroll_time, self.scroll_time + self.rect.width / self.pixels_per_time_unit
+    
+    def marker_step(self):
+        """Smallest 1/2/5 x 10^k time step keeping markers readable apart."""
+        step = 1
+        while True:
+            for factor in (1, 2, 5):
+                if step * factor * self.pixels_per_time_unit >= MARKER_SPACING:
+                    return step * factor
+            step *= 10
+    
+    def scroll(self, rows=0.0, time=0.0):
+        """Scroll by a number of rows and time units."""
+        self.scroll_row += rows
+        self.scroll_time += time
+        self._clamp()
+    
+    def zoom(self, factor, anchor_x=None):
+        """
+        Change the time scale, keeping the time under anchor_x in place.
+        
+        Args:
+            factor (float): Multiplier for the pixels per time unit
+            anchor_x (int, optional): Screen x to zoom around; defaults to
+                the middle of the timeline
+        """
+        if anchor_x is None:
+            anchor_x = self.rect.centerx
+        offset = min(max(anchor_x, self.rect.left), self.rect.right) - self.rect.x
+        time = self.scroll_time + offset / self.pixels_per_time_unit
+        self.pixels_per_time_unit = min(
+            MAX_PIXELS_PER_TIME_UNIT,
+            max(MIN_PIXELS_PER_TIME_UNIT, self.pixels_per_time_unit * factor)
+        )
+        self.scroll_time = time - offset / self.pixels_per_time_unit
+        self._clamp()
+    
+    def fit(self):
+        """Zoom so the whole time range fits the width."""
+        if self.end_time > 0:
+            self.pixels_per_time_unit = min(
+                self.default_pixels_per_time_unit,
+                max(MIN_PIXELS_PER_TIME_UNIT, self.rect.width / self.end_time)
+            )
+        self.scroll_time = 0.0
+        self._clamp()
+    
+    def ensure_visible(self, row, start, end):
+        """Scroll the least amount needed to bring an entry into view."""
+        visible_rows = (self.rect.height - 10) / self.row_height
+        if row < self.scroll_row:
+            self.scroll_row = row
+        elif row + 1 > self.scroll_row + visible_rows:
+            self.scroll_row = row + 1 - visible_rows
+        
+        span = self.rect.width / self.pixels_per_time_unit
+        if start < self.scroll_time:
+            self.scroll_time = start
+        elif end > self.scroll_time + span:
+            self.scroll_time = min(start, end - span)
+        self._clamp()
+    
+    def handle_event(self, event):
+        """
+        Scroll rows with the mouse wheel while the pointer is over the
+        timeline. Shift scrolls through time and Ctrl zooms around the pointer.
+        
+        Returns:
+            bool: Whether the event was used
+        """
+        if event.type != pygame.MOUSEWHEEL:
+            return False
+        pos = pygame.mouse.get_pos()
+        if not self.rect.collidepoint(pos):
+            return False
+        
+        mods = pygame.key.get_mods()
+        if mods & pygame.KMOD_CTRL:
+            self.zoom(ZOOM_STEP ** event.y, pos[0])
+        elif mods & pygame.KMOD_SHIFT:
+            self.scroll(time=-event.y * MARKER_SPACING / self.pixels_per_time_unit)
+        else:
+            self.scroll(rows=-event.y,
+                        time=event.x * MARKER_SPACING / self.pixels_per_time_unit)
+        return True
+    
+    def _clamp(self):
+        max_row = max(0.0, self.rows - (self.rect.height - 10) / self.row_height)
+        max_time = max(0.0, self.end_time - self.rect.width / self.pixels_per_time_unit)
+        self.scroll_row = min(max(self.scroll_row, 0.0), max_row)
+        self.scroll_time = min(max(self.scroll_time, 0.0), max_time)
+
+class TaskListView:
+    """Vertically scrolling window onto a list of equally tall rows."""
+    
+    def __init__(self, rect, row_height=40):
+        """
+        Args:
+            rect (pygame.Rect): Screen area of the rows
+            row_height (int): Height of a row including spacing
+        """
+        self.rect = pygame.Rect(rect)
+        self.row_height = row_height
+        self.scroll_row = 0.0
+        self.rows = 0
+    
+    def set_rows(self, rows):
+        """Set the number of rows, keeping the scroll position in range."""
+        self.rows = rows
+        self._clamp()
+    
+    def row_y(self, row):
+        """Screen y coordinate of the top of a row."""
+        return self.rect.y + round((row - self.scroll_row) * self.row_height)
+    
+    def visible_rows(self):
+        """
+        Returns:
+            tuple: (first_row, end_row) of the rows in view, end exclusive
+        """
+        first_row = int(self.scroll_row)
+        end_row = min(self.rows, math.ceil(self.scroll_row + self.rect.height / self.row_height))
+        return first_row, end_row
+    
+    def scroll(self, rows):
+        """Scroll by a number of rows."""
+        self.scroll_row += rows
+        self._clamp()
+    
+    def ensure_visible(self, row):
+        """Scroll the least amount needed to bring a row into view."""
+        visible_rows = self.rect.height / self.row_height
+        if row < self.scroll_row:
+            self.scroll_row = row
+        elif row + 1 > self.scroll_row + visible_rows:
+            self.scroll_row = row + 1 - visible_rows
+        self._clamp()
+    
+    def handle_event(self, event):
+        """
+        Scroll with the mouse wheel while the pointer is over the list.
+        
+        Returns:
+            bool: Whether the event was used
+        """
+        if event.type != pygame.MOUSEWHEEL:
+            return False
+        if not self.rect.collidepoint(pygame.mouse.get_pos()):
+            return False
+        self.scroll(-event.y)
+        return True
+    
+    def _clamp(self):
+        max_row = max(0.0, self.rows - self.rect.height / self.row_height)
+        self.scroll_row = min(max(self.scroll_row, 0.0), max_row)
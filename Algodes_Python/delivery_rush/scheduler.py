@@ -3,10 +3,15 @@ Implementation of the Earliest Deadline First (EDF) scheduling algorithm
 for minimizing maximum lateness in delivery scheduling.
 """
 
+import heapq
+from collections import deque
 from dataclasses import dataclass
-from typing import List, Optional, Tuple
+from operator import attrgetter
+from typing import Deque, Generator, Iterator, List, Optional, Tuple
 from enum import Enum, auto
 
+import numpy as np
+
 class TaskType(Enum):
     """Types of delivery tasks with different characteristics."""
     HOT_PIZZA = auto()      # Short processing, tight deadline
@@ -14,13 +19,35 @@ class TaskType(Enum):
     REGULAR = auto()        # Longer processing, flexible deadline
     EXPRESS = auto()        # Short processing, moderate deadline
 
-@dataclass
+@dataclass(frozen=True, init=False)
 class Task:
-    """Represents a delivery task with timing constraints."""
+    """Represents a delivery task with timing constraints. Immutable, with a cached hash."""
+    __slots__ = ('name', 'processing_time', 'deadline', 'task_type', 'release_time', '_hash')
     name: str
     processing_time: int    # Time needed to complete delivery
     deadline: int          # When delivery must be completed
     task_type: TaskType
+    release_time: int  # When the order becomes available (online scheduling only)
+    
+    # Written out because dataclass fields with defaults cannot be slots before Python 3.10
+    def __init__(self, name: str, processing_time: int, deadline: int, task_type: TaskType,
+                 release_time: int = 0):
+        object.__setattr__(self, 'name', name)
+        object.__setattr__(self, 'processing_time', processing_time)
+        object.__setattr__(self, 'deadline', deadline)
+        object.__setattr__(self, 'task_type', task_type)
+        object.__setattr__(self, 'release_time', release_time)
+        object.__setattr__(self, '_hash', hash(
+            (name, processing_time, deadline, task_type, release_time)
+        ))
+    
+    def __hash__(self):
+        return self._hash
+    
+    def __reduce__(self):
+        # Frozen slotted instances cannot be restored attribute by attribute
+        return (Task, (self.name, self.processing_time, self.deadline, self.task_type,
+                       self.release_time))
     
     def lateness(self, completion_time: int) -> int:
         """Calculate how late the task is based on completion time."""
@@ -31,33 +58,149 @@ class VisualizationState:
     def __init__(self):
         self.current_time = 0
         self.current_task: Optional[Task] = None
+        self.current_index: Optional[int] = None  # Index of current_task in scheduled_tasks
         self.scheduled_tasks: List[Tuple[Task, int, int]] = []  # (task, start, end)
-        self.remaining_tasks: List[Task] = []
+        self.remaining_tasks: Deque[Task] = deque()  # Unscheduled tasks in EDF order
         self.max_lateness = 0
         self.step_description = ""
         self.sorting_indices: List[int] = []  # Indices being compared during sort
         self.completed = False
+        
+        # Multi-courier scheduling
+        self.couriers = 1
+        self.scheduled_couriers: List[int] = []  # Courier of each entry in scheduled_tasks
+
+@dataclass
+class CourierSchedule:
+    """Stores a schedule spread over several couriers."""
+    courier_schedules: List[List[Tuple[Task, int, int]]]  # (task, start, end) per courier
+    max_lateness: int
+
+class TaskColumns:
+    """
+    Tasks stored as one int64 array per field.
+    
+    Holds only the timing fields the scheduler needs, at 24 bytes per task
+    instead of a Task object per task, and can be passed straight to
+    schedule_task_columns.
+    """
+    
+    def __init__(self, processing_time: np.ndarray, deadline: np.ndarray,
+                 release_time: Optional[np.ndarray] = None):
+        """
+        Args:
+            processing_time: Processing time of each task
+            deadline: Deadline of each task
+            release_time: Release time of each task; all 0 when omitted
+        """
+        self.processing_time = np.asarray(processing_time, dtype=np.int64)
+        self.deadline = np.asarray(deadline, dtype=np.int64)
+        if release_time is None:
+            release_time = np.zeros(len(self.deadline), dtype=np.int64)
+        self.release_time = np.asarray(release_time, dtype=np.int64)
+        if not (self.processing_time.shape == self.deadline.shape == self.release_time.shape):
+            raise ValueError("All columns must be equally long")
+    
+    @classmethod
+    def from_tasks(cls, tasks: List[Task]) -> 'TaskColumns':
+        """Copy the timing fields of a list of tasks."""
+        def column(field):
+            return np.fromiter(map(attrgetter(field), tasks), dtype=np.int64, count=len(tasks))
+        return cls(column('processing_time'), column('deadline'), column('release_time'))
+    
+    def __len__(self) -> int:
+        return len(self.deadline)
+
+@dataclass
+class ColumnSchedule:
+    """Stores a single-courier schedule of TaskColumns as arrays."""
+    order: np.ndarray  # Task indices in schedule order
+    start_times: np.ndarray  # Start time of each entry in order
+    end_times: np.ndarray  # End time of each entry in order
+    max_lateness: int
 
-def schedule_tasks(tasks: List[Task], viz_state: VisualizationState) -> List[Tuple[Task, int, int]]:
+def _run_steps(steps: Iterator[VisualizationState]):
+    """Drive a step generator to completion and return its result."""
+    while True:
+        try:
+            next(steps)
+        except StopIteration as done:
+            return done.value
+
+def schedule_tasks(tasks: List[Task],
+                   viz_state: Optional[VisualizationState] = None) -> List[Tuple[Task, int, int]]:
     """
     Schedule tasks using Earliest Deadline First to minimize maximum lateness.
     
+    Args:
+        tasks: List of tasks to schedule
+        viz_state: Optional visualization state to update. Without one the
+            algorithm runs headless, with no tracing at all.
+        
+    Returns:
+        List of (task, start_time, end_time) tuples representing the schedule
+    """
+    if viz_state is not None:
+        return _run_steps(schedule_steps(tasks, viz_state))
+    
+    schedule = []
+    current_time = 0
+    for task in sorted(tasks, key=attrgetter('deadline')):
+        end_time = current_time + task.processing_time
+        schedule.append((task, current_time, end_time))
+        current_time = end_time
+    return schedule
+
+def schedule_task_columns(tasks: TaskColumns) -> ColumnSchedule:
+    """
+    Earliest Deadline First over columnar tasks, as whole-array operations.
+    
+    The order is the one schedule_tasks produces: a stable sort by deadline
+    with the tasks run back to back from time 0.
+    
+    Args:
+        tasks: Tasks to schedule
+        
+    Returns:
+        ColumnSchedule of the tasks
+    """
+    order = np.argsort(tasks.deadline, kind='stable')
+    end_times = np.cumsum(tasks.processing_time[order])
+    start_times = end_times - tasks.processing_time[order]
+    lateness = end_times - tasks.deadline[order]
+    max_lateness = max(0, int(lateness.max())) if len(lateness) else 0
+    return ColumnSchedule(order, start_times, end_times, max_lateness)
+
+def get_max_lateness(schedule: List[Tuple[Task, int, int]]) -> int:
+    """Get the maximum lateness of a schedule."""
+    return max((max(0, end - task.deadline) for task, _, end in schedule), default=0)
+
+def schedule_steps(tasks: List[Task], viz_state: VisualizationState
+                   ) -> Generator[VisualizationState, None, List[Tuple[Task, int, int]]]:
+    """
+    Step-by-step version of schedule_tasks.
+    
     Args:
         tasks: List of tasks to schedule
         viz_state: Current visualization state to update
         
+    Yields:
+        viz_state after sorting and after each scheduled task
+        
     Returns:
         List of (task, start_time, end_time) tuples representing the schedule
     """
     if not tasks:
+        viz_state.completed = True
         return []
     
     # Sort tasks by deadline (EDF)
     tasks_sorted = sorted(tasks, key=lambda t: t.deadline)
     
     # Update visualization state
-    viz_state.remaining_tasks = tasks_sorted.copy()
+    viz_state.remaining_tasks = deque(tasks_sorted)
     viz_state.step_description = "Sorting tasks by deadline (Earliest Deadline First)"
+    yield viz_state
     
     current_time = 0
     schedule = []
@@ -79,13 +222,15 @@ def schedule_tasks(tasks: List[Task], viz_state: VisualizationState) -> List[Tup
         max_lateness = max(max_lateness, lateness)
         
         # Update visualization state
+        viz_state.current_index = len(viz_state.scheduled_tasks)
         viz_state.scheduled_tasks.append((task, start_time, end_time))
         viz_state.max_lateness = max_lateness
-        viz_state.remaining_tasks.remove(task)
+        viz_state.remaining_tasks.popleft()  # Tasks are taken in EDF order
         viz_state.step_description = (
             f"Scheduled {task.name} (Start: {start_time}, End: {end_time}, "
             f"Deadline: {task.deadline}, Lateness: {lateness})"
         )
+        yield viz_state
         
         # Move time forward
         current_time = end_time
@@ -93,6 +238,101 @@ def schedule_tasks(tasks: List[Task], viz_state: VisualizationState) -> List[Tup
     viz_state.completed = True
     return schedule
 
+def schedule_tasks_parallel(tasks: List[Task], couriers: int,
+                            viz_state: Optional[VisualizationState] = None) -> CourierSchedule:
+    """
+    Schedule tasks over several couriers.
+    
+    Tasks are taken in Earliest Deadline First order and each one goes to the
+    courier that becomes available first, tracked with a heap of
+    (available_time, courier) pairs. This is O(n log n + n log k) for n tasks
+    and k couriers.
+    
+    Args:
+        tasks: List of tasks to schedule
+        couriers: Number of couriers
+        viz_state: Optional visualization state to update. Without one the
+            algorithm runs headless, with no tracing at all.
+        
+    Returns:
+        CourierSchedule with one (task, start_time, end_time) list per courier
+    """
+    if viz_state is not None:
+        return _run_steps(schedule_parallel_steps(tasks, couriers, viz_state))
+    if couriers < 1:
+        raise ValueError("At least one courier is needed")
+    
+    courier_schedules = [[] for _ in range(couriers)]
+    available = [(0, courier) for courier in range(couriers)]
+    max_lateness = 0
+    for task in sorted(tasks, key=attrgetter('deadline')):
+        start_time, courier = available[0]
+        end_time = start_time + task.processing_time
+        courier_schedules[courier].append((task, start_time, end_time))
+        if end_time - task.deadline > max_lateness:
+            max_lateness = end_time - task.deadline
+        heapq.heapreplace(available, (end_time, courier))
+    
+    return CourierSchedule(courier_schedules, max_lateness)
+
+def schedule_parallel_steps(tasks: List[Task], couriers: int, viz_state: VisualizationState
+                            ) -> Generator[VisualizationState, None, CourierSchedule]:
+    """
+    Step-by-step version of schedule_tasks_parallel.
+    
+    Args:
+        tasks: List of tasks to schedule
+        couriers: Number of couriers
+        viz_state: Current visualization state to update
+        
+    Yields:
+        viz_state after sorting and after each assigned task
+        
+    Returns:
+        CourierSchedule with one (task, start_time, end_time) list per courier
+    """
+    if couriers < 1:
+        raise ValueError("At least one courier is needed")
+    
+    viz_state.couriers = couriers
+    
+    # Sort tasks by deadline (EDF)
+    tasks_sorted = sorted(tasks, key=lambda t: t.deadline)
+    viz_state.remaining_tasks = deque(tasks_sorted)
+    viz_state.step_description = "Sorting tasks by deadline (Earliest Deadline First)"
+    yield viz_state
+    
+    courier_schedules = [[] for _ in range(couriers)]
+    available = [(0, courier) for courier in range(couriers)]
+    max_lateness = 0
+    
+    for task in tasks_sorted:
+        # Next free courier takes the most urgent task
+        start_time, courier = available[0]
+        end_time = start_time + task.processing_time
+        courier_schedules[courier].append((task, start_time, end_time))
+        heapq.heapreplace(available, (end_time, courier))
+        
+        lateness = task.lateness(end_time)
+        max_lateness = max(max_lateness, lateness)
+        
+        # Update visualization state
+        viz_state.current_task = task
+        viz_state.current_time = start_time
+        viz_state.current_index = len(viz_state.scheduled_tasks)
+        viz_state.scheduled_tasks.append((task, start_time, end_time))
+        viz_state.scheduled_couriers.append(courier)
+        viz_state.max_lateness = max_lateness
+        viz_state.remaining_tasks.popleft()  # Tasks are taken in EDF order
+        viz_state.step_description = (
+            f"Courier {courier + 1} takes {task.name} (Start: {start_time}, End: {end_time}, "
+            f"Deadline: {task.deadline}, Lateness: {lateness})"
+        )
+        yield viz_state
+    
+    viz_state.completed = True
+    return CourierSchedule(courier_schedules, max_lateness)
+
 def get_task_color(task_type: TaskType) -> Tuple[int, int, int]:
     """Get the display color for a task type."""
     colors = {
@@ -0,0 +1,96 @@
+"""
+Batch solving of many independent knapsack instances on a process pool.
+"""
+
+import multiprocessing
+import os
+from collections import deque
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from knapsack import Item, ItemColumns, KnapsackSolution, solve_knapsack_columns
+
+DEFAULT_CHUNK_SIZE = 16  # Instances sent to a worker at a time
+MAX_CHUNKS_IN_FLIGHT = 4  # Per worker; bounds memory when the input is long
+
+def _solve_arrays(weights: np.ndarray, values: np.ndarray, capacity: int) -> Tuple[int, np.ndarray]:
+    """
+    Solve one instance given as item arrays.
+    
+    Returns:
+        (maximum value, indices of the selected items)
+    """
+    solution = solve_knapsack_columns(ItemColumns(weights, values), capacity)
+    return solution.value, solution.selected
+
+def _solve_chunk(chunk: List[Tuple[np.ndarray, np.ndarray, int]]) -> List[Tuple[int, np.ndarray]]:
+    """Solve a chunk of instances. Runs in the worker processes."""
+    return [_solve_arrays(*problem) for problem in chunk]
+
+def _chunks(problems: Iterable[Tuple[List[Item], int]], chunk_size: int
+            ) -> Iterator[Tuple[List[List[Item]], List[Tuple[np.ndarray, np.ndarray, int]]]]:
+    """Group instances into chunks, as (item lists, array-encoded instances) pairs."""
+    items_chunk, encoded_chunk = [], []
+    for items, capacity in problems:
+        columns = ItemColumns.from_items(items)
+        items_chunk.append(items)
+        encoded_chunk.append((columns.weight, columns.value, capacity))
+        if len(encoded_chunk) == chunk_size:
+            yield items_chunk, encoded_chunk
+            items_chunk, encoded_chunk = [], []
+    if encoded_chunk:
+        yield items_chunk, encoded_chunk
+
+def _decode(items_chunk: List[List[Item]], results: List[Tuple[int, np.ndarray]]
+            ) -> Iterator[KnapsackSolution]:
+    """Turn worker results back into solutions over the original items."""
+    for items, (value, selected) in zip(items_chunk, results):
+        yield KnapsackSolution(value, {items[i] for i in selected})
+
+def solve_knapsack_batch(problems: Iterable[Tuple[List[Item], int]],
+                         workers: Optional[int] = None,
+                         chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[KnapsackSolution]:
+    """
+    Solve independent knapsack instances in parallel.
+    
+    Instances are grouped into chunks, and each instance is sent to the
+    workers as two int64 arrays of weights and values rather than as pickled
+    Items. Workers send back the optimal value and the indices of the
+    selected items. Solutions are yielded in input order as soon as they are
+    ready, and only a few chunks per worker are in flight at a time, so the
+    input can be a generator of any length.
+    
+    Args:
+        problems: Iterable of (items, capacity) instances
+        workers: Number of worker processes; defaults to the CPU count. With
+            1, the instances are solved in this process.
+        chunk_size: Number of instances a worker takes at a time. Larger
+            chunks cut inter-process overhead for many small instances.
+        
+    Yields:
+        KnapsackSolution of each instance, with the same selection
+        solve_knapsack_numpy finds
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError("At least one worker is needed")
+    if chunk_size < 1:
+        raise ValueError("Chunk size must be at least 1")
+    
+    if workers == 1:
+        for items_chunk, encoded_chunk in _chunks(problems, chunk_size):
+            yield from _decode(items_chunk, _solve_chunk(encoded_chunk))
+        return
+    
+    with multiprocessing.Pool(workers) as pool:
+        in_flight = deque()  # (item lists, AsyncResult) of submitted chunks, oldest first
+        for items_chunk, encoded_chunk in _chunks(problems, chunk_size):
+            in_flight.append((items_chunk, pool.apply_async(_solve_chunk, (encoded_chunk,))))
+            if len(in_flight) >= MAX_CHUNKS_IN_FLIGHT * workers:
+                items_chunk, result = in_flight.popleft()
+                yield from _decode(items_chunk, result.get())
+        while in_flight:
+            items_chunk, result = in_flight.popleft()
+            yield from _decode(items_chunk, result.get())
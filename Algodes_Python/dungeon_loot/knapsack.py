@@ -3,10 +3,14 @@ Implementation of the Dynamic Programming solution to the 0/1 Knapsack Problem.
 Includes visualization state tracking for educational purposes.
 """
 
+import math
 from dataclasses import dataclass
-from typing import List, Dict, Set, Optional, Tuple
+from functools import reduce
+from typing import Generator, Iterator, List, Dict, Sequence, Set, Optional, Tuple
 from enum import Enum, auto
 
+import numpy as np
+
 class ItemType(Enum):
     """Types of dungeon items with different characteristics."""
     GOLDEN_CHALICE = auto()  # High value, medium weight
@@ -15,33 +19,92 @@ class ItemType(Enum):
     HEALTH_POTION = auto()   # Low value, low weight
     DRAGON_SCALE = auto()    # Very high value, very high weight
 
-@dataclass
+@dataclass(frozen=True)
 class Item:
-    """Represents a dungeon item with weight and value."""
+    """Represents a dungeon item with weight and value. Immutable, with a cached hash."""
+    __slots__ = ('name', 'weight', 'value', 'item_type', '_hash')
     name: str
     weight: int
     value: int
     item_type: ItemType
     
+    def __post_init__(self):
+        object.__setattr__(self, '_hash', hash((self.name, self.weight, self.value, self.item_type)))
+    
     def __hash__(self):
-        """Make Item hashable for use in sets."""
-        return hash((self.name, self.weight, self.value, self.item_type))
-    
-    def __eq__(self, other):
-        """Define equality for Item objects."""
-        if not isinstance(other, Item):
-            return False
-        return (self.name == other.name and
-                self.weight == other.weight and
-                self.value == other.value and
-                self.item_type == other.item_type)
+        """Make Item hashable for use in sets, without rebuilding the key tuple."""
+        return self._hash
+    
+    def __reduce__(self):
+        # Frozen slotted instances cannot be restored attribute by attribute
+        return (Item, (self.name, self.weight, self.value, self.item_type))
+
+class ItemSelection:
+    """
+    Selected items of an item list, kept as one flag byte per index.
+    
+    Membership tests and updates are O(1) lookups by index that never hash
+    an Item, and copy() is a single bytearray copy. Iterating yields the
+    selected items in list order, and to_set() converts to the set of items
+    KnapsackSolution uses.
+    """
+    
+    __slots__ = ('items', '_flags', '_count')
+    
+    def __init__(self, items: Sequence[Item] = ()):
+        """
+        Args:
+            items: The items that indices refer to
+        """
+        self.items = items
+        self._flags = bytearray(len(items))
+        self._count = 0
+    
+    def add(self, index: int):
+        """Select the item at an index."""
+        if not self._flags[index]:
+            self._flags[index] = 1
+            self._count += 1
+    
+    def discard(self, index: int):
+        """Deselect the item at an index, if selected."""
+        if self._flags[index]:
+            self._flags[index] = 0
+            self._count -= 1
+    
+    def __contains__(self, index: int) -> bool:
+        """Whether the item at an index is selected; False outside the list."""
+        return 0 <= index < len(self._flags) and bool(self._flags[index])
+    
+    def __len__(self) -> int:
+        return self._count
+    
+    def __iter__(self) -> Iterator[Item]:
+        """Yield the selected items in list order."""
+        return (item for item, flag in zip(self.items, self._flags) if flag)
+    
+    def indices(self) -> List[int]:
+        """Indices of the selected items, ascending."""
+        return [index for index, flag in enumerate(self._flags) if flag]
+    
+    def copy(self) -> 'ItemSelection':
+        """Snapshot of the selection; the item list is shared, not copied."""
+        snapshot = ItemSelection.__new__(ItemSelection)
+        snapshot.items = self.items
+        snapshot._flags = bytearray(self._flags)
+        snapshot._count = self._count
+        return snapshot
+    
+    def to_set(self) -> Set[Item]:
+        """The selected items as a set."""
+        return set(self)
 
 class VisualizationState:
     """Tracks the current state of algorithm visualization."""
     def __init__(self):
         self.dp_table: List[List[int]] = []  # Dynamic programming table
         self.current_cell: Optional[Tuple[int, int]] = None  # Current cell being computed
-        self.selected_items: Set[Item] = set()  # Items selected in current solution
+        self.selected_items = ItemSelection()  # Items selected in current solution
         self.current_weight = 0  # Current weight being considered
         self.current_value = 0  # Current value being considered
         self.backtracking = False  # Whether we're in backtracking phase
@@ -53,6 +116,12 @@ class VisualizationState:
         self.highlighted_cells: List[Tuple[int, int]] = []  # Cells to highlight
         self.comparison_values: Optional[Tuple[int, int]] = None  # Values being compared
 
+@dataclass
+class KnapsackSolution:
+    """Stores the result of a knapsack calculation."""
+    value: int
+    selected_items: Set[Item]
+
 def get_item_color(item_type: ItemType) -> Tuple[int, int, int]:
     """Get the display color for an item type."""
     colors = {
@@ -86,16 +155,519 @@ def get_item_description(item_type: ItemType) -> str:
     }
     return descriptions[item_type]
 
-def solve_knapsack(items: List[Item], capacity: int, viz_state: VisualizationState) -> int:
+def _run_steps(steps: Iterator[VisualizationState]):
+    """Drive a step generator to completion and return its result."""
+    while True:
+        try:
+            next(steps)
+        except StopIteration as done:
+            return done.value
+
+def solve_knapsack(items: List[Item], capacity: int,
+                   viz_state: Optional[VisualizationState] = None) -> int:
     """
     Solve the 0/1 Knapsack Problem using dynamic programming.
     Updates visualization state for educational purposes.
     
+    Args:
+        items: List of items to choose from
+        capacity: Maximum weight capacity
+        viz_state: Optional visualization state to update. Without one the
+            algorithm runs headless, with no tracing at all.
+        
+    Returns:
+        Maximum value achievable within weight constraint
+    """
+    if viz_state is not None:
+        return _run_steps(knapsack_steps(items, capacity, viz_state))
+    
+    # Only the value is wanted, so a single row updated in place will do
+    row = np.zeros(capacity + 1, dtype=np.int64)
+    for item in items:
+        _update_row(row, item.weight, item.value)
+    return int(row[capacity])
+
+def solve_knapsack_dense(items: List[Item], capacity: int) -> KnapsackSolution:
+    """
+    Headless version of solve_knapsack that also returns the selected items.
+    
+    Builds the same (n+1) x (capacity+1) table and backtracks through it the
+    same way, but computes each row with a single list comprehension.
+    
+    Args:
+        items: List of items to choose from
+        capacity: Maximum weight capacity
+        
+    Returns:
+        KnapsackSolution with the maximum value and the selected items
+    """
+    dp = [[0] * (capacity + 1)]
+    for item in items:
+        dp.append(_next_row(dp[-1], item.weight, item.value))
+    
+    # Backtrack to find selected items
+    w = capacity
+    selected = set()
+    for i in range(len(items), 0, -1):
+        if dp[i][w] != dp[i - 1][w]:
+            item = items[i - 1]
+            selected.add(item)
+            w -= item.weight
+    
+    return KnapsackSolution(dp[-1][capacity], selected)
+
+def solve_knapsack_numpy(items: List[Item], capacity: int) -> KnapsackSolution:
+    """
+    Headless knapsack solver that computes each DP row as one array operation.
+    
+    Args:
+        items: List of items to choose from
+        capacity: Maximum weight capacity
+        
+    Returns:
+        KnapsackSolution with the maximum value and the selected items
+    """
+    weights, values = item_arrays(items)
+    dp = dp_table_numpy(weights, values, capacity)
+    selected = {items[i] for i in backtrack_table(dp, weights, capacity)}
+    return KnapsackSolution(int(dp[-1, capacity]), selected)
+
+class ItemColumns:
+    """
+    Items stored as one int64 array of weights and one of values.
+    
+    Holds only what the solver needs, at 16 bytes per item instead of an
+    Item object per item, and can be passed straight to
+    solve_knapsack_columns.
+    """
+    
+    def __init__(self, weight: np.ndarray, value: np.ndarray):
+        """
+        Args:
+            weight: Weight of each item
+            value: Value of each item, as many as weights
+        """
+        self.weight = np.asarray(weight, dtype=np.int64)
+        self.value = np.asarray(value, dtype=np.int64)
+        if self.weight.shape != self.value.shape or self.weight.ndim != 1:
+            raise ValueError(f"Expected two equally long 1-D arrays, got shapes "
+                             f"{self.weight.shape} and {self.value.shape}")
+    
+    @classmethod
+    def from_items(cls, items: List[Item]) -> 'ItemColumns':
+        """Copy the weights and values of a list of items."""
+        return cls(*item_arrays(items))
+    
+    def __len__(self) -> int:
+        return len(self.weight)
+
+@dataclass
+class ColumnSolution:
+    """Stores the result of a knapsack calculation over ItemColumns."""
+    value: int
+    selected: np.ndarray  # Indices of the selected items, ascending
+
+def solve_knapsack_columns(items: ItemColumns, capacity: int) -> ColumnSolution:
+    """
+    Knapsack solver for columnar items, returning the selection as indices.
+    
+    Selects the same items as solve_knapsack_numpy.
+    
+    Args:
+        items: Items to choose from
+        capacity: Maximum weight capacity
+        
+    Returns:
+        ColumnSolution with the maximum value and the selected indices
+    """
+    dp = dp_table_numpy(items.weight, items.value, capacity)
+    selected = np.array(backtrack_table(dp, items.weight, capacity), dtype=np.intp)
+    return ColumnSolution(int(dp[-1, capacity]), selected)
+
+def build_dp_table_numpy(items: List[Item], capacity: int) -> np.ndarray:
+    """
+    Build the knapsack DP table with vectorized row updates.
+    
+    The result is identical to the dp_table solve_knapsack records in its
+    visualization state, so it can be checked against it with
+    np.array_equal.
+    
+    Args:
+        items: List of items to choose from
+        capacity: Maximum weight capacity
+        
+    Returns:
+        int64 array of shape (n + 1, capacity + 1)
+    """
+    return dp_table_numpy(*item_arrays(items), capacity)
+
+def item_arrays(items: List[Item]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Get the item weights and values as int64 arrays.
+    
+    Args:
+        items: List of items
+        
+    Returns:
+        (weights, values), in the order of items
+    """
+    weights = np.fromiter((item.weight for item in items), dtype=np.int64, count=len(items))
+    values = np.fromiter((item.value for item in items), dtype=np.int64, count=len(items))
+    return weights, values
+
+def dp_table_numpy(weights: np.ndarray, values: np.ndarray, capacity: int) -> np.ndarray:
+    """
+    Fill the DP table for items given as arrays, as build_dp_table_numpy does.
+    
+    Row i is max(row i-1, row i-1 shifted by weight + value).
+    
+    Args:
+        weights: Item weights
+        values: Item values, in the same order as weights
+        capacity: Maximum weight capacity
+        
+    Returns:
+        int64 array of shape (n + 1, capacity + 1)
+    """
+    dp = np.zeros((len(weights) + 1, capacity + 1), dtype=np.int64)
+    for i in range(1, len(weights) + 1):
+        prev, row = dp[i - 1], dp[i]
+        weight, value = int(weights[i - 1]), int(values[i - 1])
+        row[:] = prev
+        if weight <= capacity:
+            np.maximum(prev[weight:], prev[:capacity + 1 - weight] + value, out=row[weight:])
+    return dp
+
+def extend_dp_table(dp: np.ndarray, weights: np.ndarray, values: np.ndarray,
+                    capacity: int) -> np.ndarray:
+    """
+    Widen a DP table to a larger capacity, computing only the new columns.
+    
+    Args:
+        dp: Table from dp_table_numpy for the same items
+        weights: Item weights, in the order of the table rows
+        values: Item values, in the same order
+        capacity: New capacity, at least the table's current one
+        
+    Returns:
+        New int64 array of shape (n + 1, capacity + 1)
+    """
+    old_width = dp.shape[1]
+    wider = np.zeros((dp.shape[0], capacity + 1), dtype=np.int64)
+    wider[:, :old_width] = dp
+    for i in range(1, len(weights) + 1):
+        prev, row = wider[i - 1], wider[i]
+        weight, value = int(weights[i - 1]), int(values[i - 1])
+        row[old_width:] = prev[old_width:]
+        start = max(old_width, weight)
+        if start <= capacity:
+            np.maximum(prev[start:], prev[start - weight:capacity + 1 - weight] + value,
+                       out=row[start:])
+    return wider
+
+def backtrack_table(dp: np.ndarray, weights: np.ndarray, capacity: int) -> List[int]:
+    """
+    Get the selected items by backtracking through a full DP table.
+    
+    Args:
+        dp: Table of at least capacity + 1 columns, e.g. from dp_table_numpy
+        weights: Item weights, in the order of the table rows
+        capacity: Capacity to backtrack from
+        
+    Returns:
+        Ascending indices of the selected items
+    """
+    w = capacity
+    selected = []
+    for i in range(len(weights), 0, -1):
+        if dp[i, w] != dp[i - 1, w]:
+            selected.append(i - 1)
+            w -= int(weights[i - 1])
+    selected.reverse()
+    return selected
+
+# Most bytes of packed take/skip decisions solve_knapsack_compact keeps at once
+COMPACT_BLOCK_BYTES = 4 * 1024 * 1024
+
+def solve_knapsack_compact(items: List[Item], capacity: int) -> KnapsackSolution:
+    """
+    Space-optimized knapsack solver that keeps only single DP rows.
+    
+    The table is never stored. Rows are updated in place as int64 arrays,
+    and for a block of items whose decisions fit in COMPACT_BLOCK_BYTES, one
+    bit per cell records whether the item was taken, which is all the
+    backtracking needs. Larger instances are split by divide and conquer:
+    the row halfway through the items is computed from the row before them,
+    the upper half is backtracked from there, and then the lower half, each
+    only up to the capacity still left. The selection is exactly the one
+    solve_knapsack's backtracking finds.
+    
+    Memory is not O(capacity): every level of the split keeps the row it
+    started from. With a block being the COMPACT_BLOCK_BYTES * 8 / capacity
+    items whose decisions fit at once, it holds about
+    ceil(log2(n / block)) + 3 rows, counting the block's working row and one
+    temporary, plus one block of decisions. Each level adds about
+    n * capacity / 2 row updates to the n * capacity of the blocks. A
+    two-row Hirschberg split, which picks the capacity dividing the halves
+    by comparing a forward and a backward row, would need O(capacity) only,
+    but may return a different optimal selection when several tie.
+    
+    Args:
+        items: List of items to choose from
+        capacity: Maximum weight capacity
+        
+    Returns:
+        KnapsackSolution with the maximum value and the selected items
+    """
+    weights, values = item_arrays(items)
+    selected = []
+    if items:
+        _backtrack_compact(weights, values, 0, len(items), np.zeros(capacity + 1, dtype=np.int64),
+                           capacity, selected)
+    return KnapsackSolution(int(values[selected].sum()), {items[i] for i in selected})
+
+def _backtrack_compact(weights: np.ndarray, values: np.ndarray, lo: int, hi: int,
+                       row_lo: np.ndarray, w: int, selected: List[int]) -> int:
+    """
+    Backtrack from dp[hi][w] down to row lo, given only row dp[lo].
+    
+    Returns:
+        The remaining capacity at row lo
+    """
+    if hi - lo == 1 or (hi - lo) * (w // 8 + 1) <= COMPACT_BLOCK_BYTES:
+        return _backtrack_block(weights, values, lo, hi, row_lo, w, selected)
+    
+    # Columns above w can no longer be reached on the way down
+    row_lo = row_lo[:w + 1]
+    mid = (lo + hi) // 2
+    row_mid = row_lo.copy()
+    for i in range(lo, mid):
+        _update_row(row_mid, int(weights[i]), int(values[i]))
+    
+    w = _backtrack_compact(weights, values, mid, hi, row_mid, w, selected)
+    del row_mid
+    return _backtrack_compact(weights, values, lo, mid, row_lo, w, selected)
+
+def _backtrack_block(weights: np.ndarray, values: np.ndarray, lo: int, hi: int,
+                     row_lo: np.ndarray, w: int, selected: List[int]) -> int:
+    """Backtrack through items lo..hi from bit-packed decisions, given row dp[lo]."""
+    width = w + 1
+    row = row_lo[:width].copy()
+    taken = np.zeros(width, dtype=bool)
+    decisions = np.zeros((hi - lo, (width + 7) // 8), dtype=np.uint8)
+    for k, i in enumerate(range(lo, hi)):
+        weight, value = int(weights[i]), int(values[i])
+        if weight < width:
+            include = row[:width - weight] + value
+            taken[:weight] = False
+            np.greater(include, row[weight:], out=taken[weight:])
+            decisions[k] = np.packbits(taken)
+            np.maximum(row[weight:], include, out=row[weight:])
+    
+    # Bit w of a packed row sits in byte w // 8, most significant bit first
+    for k in range(hi - lo - 1, -1, -1):
+        if decisions[k, w >> 3] & (0x80 >> (w & 7)):
+            selected.append(lo + k)
+            w -= int(weights[lo + k])
+    return w
+
+def _update_row(row: np.ndarray, weight: int, value: int):
+    """Turn DP row i - 1 into row i in place, for an item with the given weight and value."""
+    if weight < len(row):
+        np.maximum(row[weight:], row[:len(row) - weight] + value, out=row[weight:])
+
+# Pareto merges run in Python, so weigh their size against the vectorized
+# formulations' table cells
+PARETO_COST_FACTOR = 200
+
+# Largest DP or decision table the sparse solver may allocate
+SPARSE_MAX_TABLE_BYTES = 256 * 1024 * 1024
+# Tables this small are filled directly rather than trying Pareto first
+SPARSE_SMALL_TABLE_CELLS = 1_000_000
+
+def solve_knapsack_sparse(items: List[Item], capacity: int, method: str = "auto") -> KnapsackSolution:
+    """
+    Knapsack solver for very large capacities.
+    
+    Uses one of three formulations:
+    
+    - "pareto": keep only the Pareto-optimal (weight, value) pairs after each
+      item, dropping any pair that another pair beats on both weight and value
+    - "value": index the DP by value instead of weight, storing the minimum
+      weight needed to reach each value; used when total value is small
+    - "dense": the usual weight-indexed table (solve_knapsack_numpy), with
+      weights and capacity divided by their common factor
+    
+    With "auto", formulations whose table would exceed SPARSE_MAX_TABLE_BYTES
+    are ruled out. A small enough table is filled directly; otherwise Pareto
+    runs first, and is abandoned for the cheapest remaining table only if its
+    frontiers grow past that table's cost.
+    
+    Args:
+        items: List of items to choose from
+        capacity: Maximum weight capacity
+        method: "auto", "pareto", "value" or "dense"
+        
+    Returns:
+        KnapsackSolution with the maximum value and a selection achieving it
+    """
+    # Items that can never fit don't take part
+    candidates = [i for i, item in enumerate(items) if item.weight <= capacity]
+    
+    selected = None
+    if method == "auto":
+        costs = _table_costs([items[i] for i in candidates], capacity)
+        cheapest = min(costs, key=costs.get) if costs else None
+        if cheapest is not None and costs[cheapest] <= SPARSE_SMALL_TABLE_CELLS:
+            method = cheapest
+        else:
+            budget = costs[cheapest] // PARETO_COST_FACTOR if cheapest is not None else None
+            selected = _knapsack_pareto(items, candidates, capacity, budget)
+            method = "pareto" if selected is not None else cheapest
+    elif method in ("value", "dense"):
+        if method not in _table_costs([items[i] for i in candidates], capacity):
+            raise ValueError(f"The {method} table for this instance would exceed "
+                             f"{SPARSE_MAX_TABLE_BYTES} bytes")
+    
+    if method == "pareto":
+        if selected is None:
+            selected = _knapsack_pareto(items, candidates, capacity)
+    elif method == "value":
+        selected = _knapsack_by_value(items, candidates, capacity)
+    elif method == "dense":
+        weights = [items[i].weight for i in candidates]
+        factor = reduce(math.gcd, weights, capacity) or 1
+        weights = np.array(weights, dtype=np.int64).reshape(-1) // factor
+        values = np.array([items[i].value for i in candidates], dtype=np.int64).reshape(-1)
+        dp = dp_table_numpy(weights, values, capacity // factor)
+        selected = [candidates[i] for i in backtrack_table(dp, weights, capacity // factor)]
+    else:
+        raise ValueError(f"Unknown knapsack method: {method}")
+    
+    chosen = {items[i] for i in selected}
+    return KnapsackSolution(sum(items[i].value for i in selected), chosen)
+
+def _table_costs(items: List[Item], capacity: int) -> Dict[str, int]:
+    """
+    Table cells filled by the "dense" and "value" formulations, leaving out
+    those whose tables would not fit in SPARSE_MAX_TABLE_BYTES.
+    """
+    weights = [item.weight for item in items]
+    reduced_capacity = capacity // (reduce(math.gcd, weights, capacity) or 1)
+    total_value = sum(item.value for item in items)
+    
+    costs = {}
+    dense_cells = (len(items) + 1) * (reduced_capacity + 1)
+    if dense_cells * 8 <= SPARSE_MAX_TABLE_BYTES:  # int64 table
+        costs["dense"] = dense_cells
+    value_cells = len(items) * (total_value + 1)
+    if value_cells + (total_value + 1) * 8 <= SPARSE_MAX_TABLE_BYTES:  # bool decisions, int64 row
+        costs["value"] = value_cells
+    return costs
+
+def _knapsack_pareto(items: List[Item], candidates: List[int], capacity: int,
+                     budget: Optional[int] = None) -> Optional[List[int]]:
+    """
+    Solve by keeping only non-dominated (weight, value) pairs.
+    
+    Each frontier entry is (weight, value, chain) where chain is a linked list
+    of (item index, rest of chain) recording how the pair was built.
+    
+    Args:
+        budget: Give up once this many pairs have been merged in total
+    
+    Returns:
+        Indices of the selected items, or None if the budget ran out
+    """
+    frontier = [(0, 0, None)]
+    merged_pairs = 0
+    for i in candidates:
+        weight, value = items[i].weight, items[i].value
+        limit = capacity - weight
+        shifted = [(w + weight, v + value, (i, chain))
+                   for w, v, chain in frontier if w <= limit]
+        
+        # Both lists are sorted by weight; Timsort merges the two runs
+        merged = frontier + shifted
+        merged_pairs += len(merged)
+        if budget is not None and merged_pairs > budget:
+            return None
+        merged.sort(key=lambda entry: (entry[0], -entry[1]))
+        
+        # Keep pairs whose value beats every lighter pair
+        frontier = []
+        best = -1
+        for entry in merged:
+            if entry[1] > best:
+                frontier.append(entry)
+                best = entry[1]
+    
+    selected = []
+    chain = frontier[-1][2]
+    while chain is not None:
+        i, chain = chain
+        selected.append(i)
+    selected.reverse()
+    return selected
+
+def _knapsack_by_value(items: List[Item], candidates: List[int], capacity: int) -> List[int]:
+    """
+    Solve with a value-indexed DP: min_weight[v] is the lightest way to reach value v.
+    
+    Returns:
+        Indices of the selected items
+    """
+    total_value = sum(items[i].value for i in candidates)
+    unreachable = np.iinfo(np.int64).max // 2
+    min_weight = np.full(total_value + 1, unreachable, dtype=np.int64)
+    min_weight[0] = 0
+    
+    # One row of take/skip decisions per item
+    took = np.zeros((len(candidates), total_value + 1), dtype=bool)
+    for row, i in enumerate(candidates):
+        weight, value = items[i].weight, items[i].value
+        if value == 0:
+            continue
+        include = min_weight[:total_value + 1 - value] + weight
+        better = include < min_weight[value:]
+        took[row, value:] = better
+        min_weight[value:] = np.where(better, include, min_weight[value:])
+    
+    best_value = int(np.flatnonzero(min_weight <= capacity)[-1])
+    
+    selected = []
+    v = best_value
+    for row in range(len(candidates) - 1, -1, -1):
+        if took[row, v]:
+            i = candidates[row]
+            selected.append(i)
+            v -= items[i].value
+    selected.reverse()
+    return selected
+
+def _next_row(prev: List[int], weight: int, value: int) -> List[int]:
+    """Compute DP row i from row i - 1 for an item with the given weight and value."""
+    if weight >= len(prev):
+        return prev
+    # row[w] = max(prev[w], prev[w - weight] + value)
+    return prev[:weight] + [
+        exclude if exclude >= include else include
+        for exclude, include in zip(prev[weight:], map(value.__add__, prev))
+    ]
+
+def knapsack_steps(items: List[Item], capacity: int, viz_state: VisualizationState
+                   ) -> Generator[VisualizationState, None, int]:
+    """
+    Step-by-step version of solve_knapsack.
+    
     Args:
         items: List of items to choose from
         capacity: Maximum weight capacity
         viz_state: Current visualization state to update
         
+    Yields:
+        viz_state after each table cell and each backtracking step
+        
     Returns:
         Maximum value achievable within weight constraint
     """
@@ -145,23 +717,28 @@ def solve_knapsack(items: List[Item], capacity: int, viz_state: VisualizationSta
                         f"Excluding {item.name} gives better value "
                         f"({exclude_value} ≥ {include_value})"
                     )
+            yield viz_state
     
     # Backtrack to find selected items
     viz_state.backtracking = True
     viz_state.step_description = "Backtracking to find selected items"
+    viz_state.highlighted_cells = []
+    viz_state.comparison_values = None
+    yield viz_state
     
     w = capacity
-    selected = set()
+    selected = ItemSelection(items)
     
     for i in range(n, 0, -1):
         if dp[i][w] != dp[i - 1][w]:
             item = items[i - 1]
-            selected.add(item)
+            selected.add(i - 1)
             w -= item.weight
             
             viz_state.selected_items = selected
             viz_state.current_cell = (i, w)
             viz_state.step_description = f"Selected {item.name}"
+            yield viz_state
     
     viz_state.completed = True
-    return dp[n][capacity] 
\ No newline at end of file
+    return dp[n][capacity]
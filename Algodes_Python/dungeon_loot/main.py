@@ -15,20 +15,29 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from common.game_base import GameBase
 from common.viz_utils import create_tooltip
 from knapsack import (
-    Item, ItemType, VisualizationState, solve_knapsack,
+    Item, ItemType, ItemSelection, VisualizationState, knapsack_steps,
     get_item_color, get_default_stats
 )
+from result_cache import KnapsackCache
+from table_view import DPTableView
 
 class DungeonLootGame(GameBase):
-    def __init__(self):
-        super().__init__("Dungeon Loot Manager - Knapsack Problem")
+    def __init__(self, headless=False):
+        super().__init__("Dungeon Loot Manager - Knapsack Problem", headless=headless)
         
         # Game state
         self.items = []  # List of available items
         self.capacity = 20  # Knapsack capacity
         self.viz_state = VisualizationState()
         self.algorithm_running = False
+        self.algorithm_steps = None  # Step generator of the running algorithm
+        self.algorithm_input = None  # (items, capacity) the running algorithm solves
         self.visualization_speed = 1.0
+        
+        # Solved inventories are shown instantly the next time they are started;
+        # starting again while a cached solution is shown replays the animation
+        self.result_cache = KnapsackCache()
+        self.cached_input = None  # (items, capacity) of the cached solution on screen
         self.step_timer = 0
         
         # Visual settings
@@ -38,9 +47,19 @@ class DungeonLootGame(GameBase):
         self.items_x = 50
         self.items_y = 400
         
+        # Scrollable, zoomable window onto the DP table (headers included)
+        self.table_view = DPTableView(
+            pygame.Rect(self.table_x - self.cell_size, self.table_y, self.width - 330, 300),
+            self.cell_size
+        )
+        
         # Create UI elements
         self.setup_ui()
         
+        # Only redraw what the algorithm steps and input change
+        self.dirty_rects_enabled = True
+        self.play_area = pygame.Rect(0, 0, self.width - 300, self.height)
+        
         # Tutorial state
         self.show_tutorial = True
         self.tutorial_step = 0
@@ -123,7 +142,7 @@ class DungeonLootGame(GameBase):
                 button_height
             ),
             start_value=20,
-            value_range=(10, 50),
+            value_range=(10, 1000),
             manager=self.ui_manager
         )
         
@@ -200,7 +219,11 @@ class DungeonLootGame(GameBase):
     
     def handle_event(self, event):
         """Handle game-specific events."""
-        if event.type == pygame_gui.UI_BUTTON_PRESSED:
+        if event.type == pygame.MOUSEWHEEL:
+            if self.table_view.handle_event(event):
+                self.mark_dirty(self.table_view.rect)
+        
+        elif event.type == pygame_gui.UI_BUTTON_PRESSED:
             if event.ui_element == self.start_button:
                 self.toggle_algorithm()
             elif event.ui_element == self.reset_button:
@@ -217,6 +240,21 @@ class DungeonLootGame(GameBase):
                 self.visualization_speed = min(2.0, self.visualization_speed + 0.1)
             elif event.key == pygame.K_MINUS:
                 self.visualization_speed = max(0.1, self.visualization_speed - 0.1)
+            elif event.key == pygame.K_UP:
+                self.table_view.scroll(rows=-1)
+                self.mark_dirty(self.table_view.rect)
+            elif event.key == pygame.K_DOWN:
+                self.table_view.scroll(rows=1)
+                self.mark_dirty(self.table_view.rect)
+            elif event.key == pygame.K_LEFT:
+                self.table_view.scroll(cols=-1)
+                self.mark_dirty(self.table_view.rect)
+            elif event.key == pygame.K_RIGHT:
+                self.table_view.scroll(cols=1)
+                self.mark_dirty(self.table_view.rect)
+            elif event.key == pygame.K_HOME:
+                self.table_view.fit()
+                self.mark_dirty(self.table_view.rect)
         
         elif event.type == pygame_gui.UI_DROP_DOWN_MENU_CHANGED:
             if event.ui_element == self.item_type_dropdown:
@@ -254,6 +292,7 @@ class DungeonLootGame(GameBase):
         
         self.items.append(item)
         self.items_label.set_text(f"Items: {len(self.items)}")
+        self.mark_dirty(self.item_rect(len(self.items) - 1))
     
     def update(self, time_delta):
         """Update game state."""
@@ -264,18 +303,20 @@ class DungeonLootGame(GameBase):
                 self.update_algorithm()
         
         # Update value label if we have a solution
-        if self.viz_state.dp_table and len(self.items) > 0:
-            best_value = self.viz_state.dp_table[len(self.items)][self.capacity]
+        if self.viz_state.completed and self.viz_state.dp_table:
+            best_value = self.viz_state.dp_table[-1][-1]
             self.value_label.set_text(f"Best Value: {best_value}")
     
     def draw(self):
         """Draw game elements."""
         # Draw DP table
-        if self.viz_state.dp_table:
+        if self.viz_state.dp_table and self.needs_redraw(self.table_view.rect):
             self.draw_dp_table()
         
         # Draw items
-        self.draw_items()
+        item_list = self.item_rect(0).union(self.item_rect(len(self.items) - 1))
+        if self.items and self.needs_redraw(item_list):
+            self.draw_items()
         
         # Draw current step description
         if self.viz_state.step_description:
@@ -290,8 +331,7 @@ class DungeonLootGame(GameBase):
             
         # Draw solution summary if algorithm is completed
         if self.viz_state.completed and self.viz_state.dp_table:
-            n = len(self.items)
-            max_value = self.viz_state.dp_table[n][self.capacity]
+            max_value = self.viz_state.dp_table[-1][-1]
             selected_names = [item.name for item in self.viz_state.selected_items]
             summary = f"Take these items: {', '.join(selected_names)} for maximum value of {max_value}"
             tooltip = create_tooltip(
@@ -301,7 +341,7 @@ class DungeonLootGame(GameBase):
             )
             self.screen.blit(
                 tooltip,
-                (self.table_x, self.table_y + len(self.viz_state.dp_table) * self.cell_size + 40)
+                (self.table_x, self.table_view.rect.bottom + 10)
             )
         
         # Draw tutorial if active
@@ -320,65 +360,37 @@ class DungeonLootGame(GameBase):
         if not self.viz_state.dp_table:
             return
             
-        n = len(self.items)
-        
-        # Draw column headers (weights)
-        for w in range(self.capacity + 1):
-            x = self.table_x + w * self.cell_size
-            y = self.table_y
-            pygame.draw.rect(self.screen, self.GRAY,
-                           (x, y, self.cell_size, self.cell_size))
-            self.draw_text(str(w), (x + self.cell_size//2, y + self.cell_size//2),
-                          size=20)
-        
-        # Draw row headers (items)
-        for i in range(n + 1):
-            x = self.table_x
-            y = self.table_y + (i + 1) * self.cell_size
-            pygame.draw.rect(self.screen, self.GRAY,
-                           (x - self.cell_size, y, self.cell_size, self.cell_size))
-            if i > 0:
-                item = self.items[i - 1]
-                color = get_item_color(item.item_type)
-                pygame.draw.rect(self.screen, color,
-                               (x - self.cell_size, y, self.cell_size, self.cell_size))
-            self.draw_text(str(i), (x - self.cell_size//2, y + self.cell_size//2),
-                          size=20)
-        
-        # Draw table cells
-        for i in range(n + 1):
-            for w in range(self.capacity + 1):
-                x = self.table_x + w * self.cell_size
-                y = self.table_y + (i + 1) * self.cell_size
-                
-                # Cell background
-                color = self.WHITE
-                if (i, w) == self.viz_state.current_cell:
-                    color = (200, 255, 200)  # Light green
-                elif (i, w) in self.viz_state.highlighted_cells:
-                    color = (255, 255, 200)  # Light yellow
-                
-                pygame.draw.rect(self.screen, color,
-                               (x, y, self.cell_size, self.cell_size))
-                pygame.draw.rect(self.screen, self.BLACK,
-                               (x, y, self.cell_size, self.cell_size), 1)
-                
-                # Cell value
-                if i <= len(self.viz_state.dp_table) and w < len(self.viz_state.dp_table[0]):
-                    value = self.viz_state.dp_table[i][w]
-                    self.draw_text(str(value),
-                                 (x + self.cell_size//2, y + self.cell_size//2),
-                                 size=20)
+        # Keep the cell being computed in view while the algorithm runs
+        if self.algorithm_running and self.viz_state.current_cell is not None:
+            dp_table = self.viz_state.dp_table
+            self.table_view.set_table_size(len(dp_table), len(dp_table[0]))
+            self.table_view.ensure_visible(*self.viz_state.current_cell)
+        
+        # Only the visible window of cells is drawn
+        row_colors = [self.GRAY] + [get_item_color(item.item_type) for item in self.items]
+        self.table_view.draw(
+            self.screen,
+            self.viz_state.dp_table,
+            row_colors,
+            self.viz_state.current_cell,
+            self.viz_state.highlighted_cells
+        )
+    
+    def item_rect(self, index):
+        """Screen area of the index-th item in the item list."""
+        return pygame.Rect(self.items_x, self.items_y + 70 * index, 200, 60)
     
     def draw_items(self):
         """Draw the available items and their stats."""
         x = self.items_x
         y = self.items_y
         
-        for item in self.items:
+        selected = self.viz_state.selected_items
+        for index, item in enumerate(self.items):
             # Item background
             color = get_item_color(item.item_type)
-            if item in self.viz_state.selected_items:
+            # Items are only ever appended, so indices of the solved list stay valid
+            if index in selected:
                 pygame.draw.rect(self.screen, (255, 215, 0),  # Gold
                                (x, y, 200, 60))
             pygame.draw.rect(self.screen, color, (x + 5, y + 5, 190, 50))
@@ -399,30 +411,81 @@ class DungeonLootGame(GameBase):
         self.algorithm_running = not self.algorithm_running
         if self.algorithm_running:
             self.viz_state = VisualizationState()
+            self.table_view.reset()
+            self.mark_dirty(self.play_area)
+            inputs = (list(self.items), self.capacity)
+            
+            cached = None
+            if inputs != self.cached_input:
+                cached = self.result_cache.lookup_table(*inputs)
+            if cached is not None:
+                self.show_cached_solution(inputs, *cached)
+                return
+            
+            self.cached_input = None
+            self.algorithm_input = inputs
+            self.algorithm_steps = knapsack_steps(inputs[0], inputs[1], self.viz_state)
             self.start_button.set_text("Stop Algorithm")
         else:
             self.start_button.set_text("Start Algorithm")
     
+    def show_cached_solution(self, inputs, dp_table, selected):
+        """
+        Show a solution from the result cache as if the algorithm had just finished.
+        
+        Args:
+            inputs (tuple): (items, capacity) that were solved
+            dp_table: DP table of the solution
+            selected (list): Indices of the selected items
+        """
+        items, _ = inputs
+        self.viz_state.dp_table = dp_table.tolist()
+        self.viz_state.selected_items = ItemSelection(items)
+        for index in selected:
+            self.viz_state.selected_items.add(index)
+        self.viz_state.completed = True
+        self.viz_state.step_description = "Solution loaded from cache. Press Start again to replay it."
+        
+        self.cached_input = inputs
+        self.algorithm_running = False
+        self.table_view.invalidate()
+        self.mark_dirty(self.play_area)
+    
     def reset_game(self):
         """Reset the game state."""
         self.items = []
         self.viz_state = VisualizationState()
         self.algorithm_running = False
+        self.algorithm_steps = None
+        self.cached_input = None
         self.start_button.set_text("Start Algorithm")
         self.items_label.set_text("Items: 0")
         self.value_label.set_text("Best Value: -")
+        self.mark_dirty(self.play_area)
     
     def update_algorithm(self):
         """Update algorithm visualization state."""
         if not self.algorithm_running:
             return
             
-        # Run knapsack algorithm
-        solve_knapsack(self.items, self.capacity, self.viz_state)
-        
-        if self.viz_state.completed:
+        # Advance the knapsack algorithm by a single step
+        try:
+            next(self.algorithm_steps)
+            self.table_view.invalidate()
+        except StopIteration:
+            # Remember the solution, with its table for later capacity changes
+            self.result_cache.store_table(*self.algorithm_input, self.viz_state.dp_table)
+            self.mark_dirty(self.play_area)
             self.algorithm_running = False
+            self.algorithm_steps = None
             self.start_button.set_text("Start Algorithm")
+            return
+        
+        self.mark_dirty(self.play_area)
+    
+    def is_animating(self):
+        """Frames are only needed while the algorithm is running."""
+        return self.algorithm_running
 
 if __name__ == "__main__":
     game = DungeonLootGame()
@@ -0,0 +1,241 @@
+"""
+Memoized knapsack solving.
+Results are keyed by a fingerprint of the multiset of item weights and
+values plus the capacity, so the same inventory in any order or under other
+names is solved once. DP tables are kept as well: a solve that only changes
+the capacity reads a prefix of the stored rows, or widens them.
+"""
+
+import hashlib
+import json
+import os
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from knapsack import (
+    Item, KnapsackSolution, item_arrays, dp_table_numpy, extend_dp_table, backtrack_table
+)
+
+class _Table:
+    """A DP table with the item arrays in the order its rows were computed."""
+    
+    __slots__ = ('weights', 'values', 'dp')
+    
+    def __init__(self, weights: np.ndarray, values: np.ndarray, dp: np.ndarray):
+        self.weights = weights
+        self.values = values
+        self.dp = dp
+
+def _canonical_order(weights: np.ndarray, values: np.ndarray) -> np.ndarray:
+    """Indices sorting the items by weight, then value; stable for equal items."""
+    return np.lexsort((values, weights))
+
+def fingerprint(weights: np.ndarray, values: np.ndarray) -> str:
+    """
+    Canonical fingerprint of the multiset of (weight, value) pairs.
+    
+    Args:
+        weights: Item weights
+        values: Item values, in the same order as weights
+    
+    Returns:
+        Hex digest that is the same for any order of the items
+    """
+    order = _canonical_order(weights, values)
+    pairs = np.stack((weights[order], values[order])).astype('<i8')
+    return hashlib.sha1(pairs.tobytes()).hexdigest()
+
+class KnapsackCache:
+    """
+    LRU cache of knapsack solutions and DP tables.
+    
+    Solutions are stored with the selection in canonical item order, so they
+    can be mapped onto any list holding the same items. DP tables are bounded
+    by their total number of cells, since a single table can be large.
+    Solutions can optionally be persisted to a JSON file; tables are not.
+    """
+    
+    def __init__(self, max_results: int = 4096, max_cells: int = 20_000_000,
+                 path: Optional[str] = None):
+        """
+        Args:
+            max_results: Most solutions kept
+            max_cells: Most DP table cells kept, over all tables
+            path: JSON file to load solutions from and save() them to
+        """
+        self.max_results = max_results
+        self.max_cells = max_cells
+        self.path = path
+        self._results = OrderedDict()  # (fingerprint, capacity) -> (value, canonical selection)
+        self._tables = OrderedDict()  # fingerprint -> _Table
+        self._cells = 0
+        self.hits = 0
+        self.misses = 0
+        self.table_reuses = 0  # Misses answered from a stored table
+        
+        if path is not None and os.path.exists(path):
+            self.load()
+    
+    def __len__(self) -> int:
+        return len(self._results)
+    
+    def clear(self):
+        """Forget all solutions and tables."""
+        self._results.clear()
+        self._tables.clear()
+        self._cells = 0
+    
+    def solve(self, items: List[Item], capacity: int) -> KnapsackSolution:
+        """
+        Solve a knapsack instance, reusing earlier work where possible.
+        
+        Args:
+            items: List of items to choose from
+            capacity: Maximum weight capacity
+        
+        Returns:
+            KnapsackSolution with the maximum value and the selected items
+        """
+        value, selected = self.solve_indices(items, capacity)
+        return KnapsackSolution(value, {items[i] for i in selected})
+    
+    def solve_indices(self, items: List[Item], capacity: int) -> Tuple[int, List[int]]:
+        """
+        Like solve, with the selection as ascending indices into items.
+        
+        Returns:
+            (maximum value, indices of the selected items)
+        """
+        weights, values = item_arrays(items)
+        order = _canonical_order(weights, values)
+        key = (fingerprint(weights, values), capacity)
+        
+        result = self._results.get(key)
+        if result is not None:
+            self.hits += 1
+            self._results.move_to_end(key)
+        else:
+            self.misses += 1
+            result = self._store_result(key, self._table(key[0], weights, values, capacity))
+        
+        value, canonical = result
+        return value, sorted(int(order[position]) for position in canonical)
+    
+    def store_table(self, items: List[Item], capacity: int, dp):
+        """
+        Store a DP table filled elsewhere, such as by the visualization, and
+        its solution, so neither has to be computed again.
+        
+        Args:
+            items: List of items, in the order of the table rows
+            capacity: Maximum weight capacity
+            dp: Table of shape (n + 1, capacity + 1), as an array or nested lists
+        """
+        weights, values = item_arrays(items)
+        key = (fingerprint(weights, values), capacity)
+        table = self._tables.get(key[0])
+        if (table is not None and table.dp.shape[1] > capacity and
+                np.array_equal(table.weights, weights) and np.array_equal(table.values, values)):
+            self._tables.move_to_end(key[0])
+        else:
+            if table is not None:
+                self._cells -= table.dp.size
+                del self._tables[key[0]]
+            table = _Table(weights, values, np.asarray(dp, dtype=np.int64))
+            self._keep_table(key[0], table)
+        self._store_result(key, table)
+    
+    def _store_result(self, key: Tuple[str, int], table: _Table) -> Tuple[int, List[int]]:
+        """Backtrack a table at the key's capacity and remember the solution."""
+        capacity = key[1]
+        dp = table.dp[:, :capacity + 1]
+        selected = backtrack_table(dp, table.weights, capacity)
+        
+        # Store the selection by canonical position
+        canonical_position = np.empty(len(table.weights), dtype=np.intp)
+        canonical_position[_canonical_order(table.weights, table.values)] = np.arange(len(table.weights))
+        result = (int(dp[-1, capacity]), sorted(int(canonical_position[i]) for i in selected))
+        self._results[key] = result
+        self._results.move_to_end(key)
+        while len(self._results) > self.max_results:
+            self._results.popitem(last=False)
+        return result
+    
+    def lookup_table(self, items: List[Item], capacity: int
+                     ) -> Optional[Tuple[np.ndarray, List[int]]]:
+        """
+        Get a stored DP table without computing a new one.
+        
+        A table is only returned when it was computed for the items in this
+        same order, so its rows line up with items, and is at least capacity
+        wide. Its backtracked selection is then exactly the one
+        solve_knapsack's visualization finds.
+        
+        Args:
+            items: List of items
+            capacity: Maximum weight capacity
+        
+        Returns:
+            (table of shape (n + 1, capacity + 1), indices of the selected
+            items), or None when no matching table is stored
+        """
+        weights, values = item_arrays(items)
+        key = fingerprint(weights, values)
+        table = self._tables.get(key)
+        if (table is None or table.dp.shape[1] <= capacity or
+                not (np.array_equal(table.weights, weights) and
+                     np.array_equal(table.values, values))):
+            return None
+        
+        self.hits += 1
+        self._tables.move_to_end(key)
+        dp = table.dp[:, :capacity + 1]
+        return dp, backtrack_table(dp, weights, capacity)
+    
+    def _table(self, key: str, weights: np.ndarray, values: np.ndarray, capacity: int) -> _Table:
+        """Get the table for a fingerprint at least capacity wide, computing what is missing."""
+        table = self._tables.get(key)
+        if table is None:
+            table = _Table(weights, values, dp_table_numpy(weights, values, capacity))
+        else:
+            self.table_reuses += 1
+            self._tables.move_to_end(key)
+            if table.dp.shape[1] > capacity:
+                return table
+            self._cells -= table.dp.size
+            del self._tables[key]
+            table.dp = extend_dp_table(table.dp, table.weights, table.values, capacity)
+        self._keep_table(key, table)
+        return table
+    
+    def _keep_table(self, key: str, table: _Table):
+        """Store a table, evicting old ones over the cell budget."""
+        # Keep the table unless it alone is over the budget
+        if table.dp.size <= self.max_cells:
+            self._tables[key] = table
+            self._cells += table.dp.size
+            while self._cells > self.max_cells:
+                _, evicted = self._tables.popitem(last=False)
+                self._cells -= evicted.dp.size
+    
+    def load(self):
+        """Add the solutions saved in the cache file."""
+        with open(self.path) as f:
+            saved = json.load(f)
+        for fp, capacity, value, canonical in saved['results']:
+            self._results[(fp, capacity)] = (value, canonical)
+        while len(self._results) > self.max_results:
+            self._results.popitem(last=False)
+    
+    def save(self):
+        """Write the solutions to the cache file, least recently used first."""
+        if self.path is None:
+            raise ValueError("The cache has no file to save to")
+        results = [[fp, capacity, value, canonical]
+                   for (fp, capacity), (value, canonical) in self._results.items()]
+        temp_path = self.path + '.tmp'
+        with open(temp_path, 'w') as f:
+            json.dump({'results': results}, f)
+        os.replace(temp_path, self.path)
@@ -0,0 +1,392 @@
+"""
+Virtualized view of the knapsack DP table.
+Only the cells inside the viewport are drawn. When zoomed out too far for
+readable cells, the visible window is drawn as a value heatmap in a single
+blit instead.
+"""
+
+import math
+
+import numpy as np
+import pygame
+
+from common.layers import LayerCompositor
+from common.text_cache import render_text
+
+HEADER_SIZE = 40  # Width of the row headers and height of the column headers
+MIN_TEXT_CELL_SIZE = 16  # Smaller cells are drawn as a heatmap
+MIN_CELL_SIZE = 0.05
+MAX_CELL_SIZE = 80
+ZOOM_STEP = 1.25
+
+HEADER_COLOR = (128, 128, 128)
+GRID_COLOR = (0, 0, 0)
+CELL_COLOR = (255, 255, 255)
+CURRENT_COLOR = (200, 255, 200)  # Light green
+HIGHLIGHT_COLOR = (255, 255, 200)  # Light yellow
+HEATMAP_LOW = np.array([255, 255, 255], dtype=np.float32)
+HEATMAP_HIGH = np.array([40, 90, 200], dtype=np.float32)
+
+class DPTableView:
+    """
+    Scrollable, zoomable window onto a DP table.
+    
+    Positions are kept in cell units: scroll_row and scroll_col are the
+    (fractional) row and column at the top-left of the viewport, and
+    cell_size is the zoom level in pixels per cell.
+    """
+    
+    def __init__(self, rect, cell_size=40):
+        """
+        Args:
+            rect (pygame.Rect): Screen area of the view, headers included
+            cell_size (float): Initial width and height of a cell in pixels
+        """
+        self.rect = pygame.Rect(rect)
+        self.default_cell_size = cell_size
+        self.cell_size = cell_size
+        self.scroll_row = 0.0
+        self.scroll_col = 0.0
+        self.rows = 0
+        self.cols = 0
+        self.table_version = 0  # Bumped whenever the table values change
+        self._chrome = LayerCompositor()
+        self._heatmap = None
+        self._heatmap_key = None
+    
+    @property
+    def body(self):
+        """Screen area of the cells, excluding the headers."""
+        return pygame.Rect(
+            self.rect.x + HEADER_SIZE, self.rect.y + HEADER_SIZE,
+            self.rect.width - HEADER_SIZE, self.rect.height - HEADER_SIZE
+        )
+    
+    @property
+    def is_heatmap(self):
+        """Whether cells are too small to show their values."""
+        return self.cell_size < MIN_TEXT_CELL_SIZE
+    
+    def reset(self):
+        """Return to the default zoom level at the top-left corner."""
+        self.cell_size = self.default_cell_size
+        self.scroll_row = 0.0
+        self.scroll_col = 0.0
+    
+    def invalidate(self):
+        """Mark the table values as changed."""
+        self.table_version += 1
+    
+    def set_table_size(self, rows, cols):
+        """
+        Set the table dimensions, keeping the scroll position in range.
+        
+        Args:
+            rows (int): Number of table rows
+            cols (int): Number of table columns
+        """
+        self.rows = rows
+        self.cols = cols
+        self._clamp()
+    
+    def visible_window(self):
+        """
+        Get the cells overlapping the viewport.
+        
+        Returns:
+            tuple: (first_row, end_row, first_col, end_col), end exclusive
+        """
+        body = self.body
+        first_row = int(self.scroll_row)
+        first_col = int(self.scroll_col)
+        end_row = min(self.rows, math.ceil(self.scroll_row + body.height / self.cell_size))
+        end_col = min(self.cols, math.ceil(self.scroll_col + body.width / self.cell_size))
+        return first_row, end_row, first_col, end_col
+    
+    def cell_rect(self, row, col):
+        """Get the screen rectangle of a cell (may lie outside the viewport)."""
+        body = self.body
+        x = body.x + round((col - self.scroll_col) * self.cell_size)
+        y = body.y + round((row - self.scroll_row) * self.cell_size)
+        right = body.x + round((col + 1 - self.scroll_col) * self.cell_size)
+        bottom = body.y + round((row + 1 - self.scroll_row) * self.cell_size)
+        return pygame.Rect(x, y, max(1, right - x), max(1, bottom - y))
+    
+    def cell_at(self, pos):
+        """
+        Find the cell under a screen position.
+        
+        Returns:
+            tuple: (row, col), or None if there is no cell there
+        """
+        body = self.body
+        if not body.collidepoint(pos):
+            return None
+        row = int(self.scroll_row + (pos[1] - body.y) / self.cell_size)
+        col = int(self.scroll_col + (pos[0] - body.x) / self.cell_size)
+        if row >= self.rows or col >= self.cols:
+            return None
+        return row, col
+    
+    def scroll(self, rows=0.0, cols=0.0):
+        """Scroll the view by a number of cells."""
+        self.scroll_row += rows
+        self.scroll_col += cols
+        self._clamp()
+    
+    def zoom(self, factor, anchor=None):
+        """
+        Change the zoom level, keeping the point under anchor in place.
+        
+        Args:
+            factor (float): Multiplier for the cell size
+            anchor (tuple, optional): Screen position to zoom around;
+                defaults to the viewport centre
+        """
+        body = self.body
+        if anchor is None:
+            anchor = body.center
+        ax = min(max(anchor[0], body.left), body.right) - body.x
+        ay = min(max(anchor[1], body.top), body.bottom) - body.y
+        
+        # Table coordinates under the anchor stay fixed
+        col = self.scroll_col + ax / self.cell_size
+        row = self.scroll_row + ay / self.cell_size
+        self.cell_size = min(MAX_CELL_SIZE, max(MIN_CELL_SIZE, self.cell_size * factor))
+        self.scroll_col = col - ax / self.cell_size
+        self.scroll_row = row - ay / self.cell_size
+        self._clamp()
+    
+    def fit(self):
+        """Zoom so the whole table fits in the viewport."""
+        body = self.body
+        if self.rows and self.cols:
+            self.cell_size = min(
+                self.default_cell_size,
+                max(MIN_CELL_SIZE, min(body.width / self.cols, body.height / self.rows))
+            )
+        self.scroll_row = 0.0
+        self.scroll_col = 0.0
+    
+    def ensure_visible(self, row, col):
+        """Scroll the least amount needed to bring a cell fully into view."""
+        body = self.body
+        visible_rows = body.height / self.cell_size
+        visible_cols = body.width / self.cell_size
+        if row < self.scroll_row:
+            self.scroll_row = row
+        elif row + 1 > self.scroll_row + visible_rows:
+            self.scroll_row = row + 1 - visible_rows
+        if col < self.scroll_col:
+            self.scroll_col = col
+        elif col + 1 > self.scroll_col + visible_cols:
+            self.scroll_col = col + 1 - visible_cols
+        self._clamp()
+    
+    def handle_event(self, event):
+        """
+        Scroll or zoom with the mouse wheel while the pointer is over the view.
+        Ctrl zooms around the pointer and Shift scrolls sideways.
+        
+        Returns:
+            bool: Whether the event was used
+        """
+        if event.type != pygame.MOUSEWHEEL:
+            return False
+        pos = pygame.mouse.get_pos()
+        if not self.rect.collidepoint(pos):
+            return False
+        
+        mods = pygame.key.get_mods()
+        if mods & pygame.KMOD_CTRL:
+            self.zoom(ZOOM_STEP ** event.y, pos)
+        else:
+            # Scroll about three rows of the default size per notch
+            cells = 3 * self.default_cell_size / self.cell_size
+            if mods & pygame.KMOD_SHIFT:
+                self.scroll(cols=-event.y * cells)
+            else:
+                self.scroll(rows=-event.y * cells, cols=event.x * cells)
+        return True
+    
+    def draw(self, surface, dp_table, row_colors, current_cell=None, highlighted_cells=()):
+        """
+        Draw the visible part of the table.
+        
+        Args:
+            surface: Pygame surface to draw on
+            dp_table: Table values, a list of rows or a 2D numpy array
+            row_colors (list): Header color of each row
+            current_cell (tuple, optional): (row, col) being computed
+            highlighted_cells (iterable): (row, col) cells to highlight
+        """
+        self.set_table_size(len(dp_table), len(dp_table[0]) if len(dp_table) else 0)
+        if not self.rows or not self.cols:
+            return
+        
+        previous_clip = surface.get_clip()
+        try:
+            if self.is_heatmap:
+                self._draw_heatmap(surface, dp_table, current_cell, highlighted_cells)
+            else:
+                self._draw_cells(surface, dp_table, row_colors, current_cell, highlighted_cells)
+        finally:
+            surface.set_clip(previous_clip)
+    
+    def _clamp(self):
+        body = self.body
+        max_row = max(0.0, self.rows - body.height / self.cell_size)
+        max_col = max(0.0, self.cols - body.width / self.cell_size)
+        self.scroll_row = min(max(self.scroll_row, 0.0), max_row)
+        self.scroll_col = min(max(self.scroll_col, 0.0), max_col)
+    
+    def _font_size(self):
+        return max(10, int(20 * self.cell_size / 40))
+    
+    def _draw_cells(self, surface, dp_table, row_colors, current_cell, highlighted_cells):
+        """Draw headers, cells and values for the visible window only."""
+        window = self.visible_window()
+        first_row, end_row, _, _ = window
+        
+        # Headers and empty cells are cached until the window moves
+        visible_colors = tuple(
+            row_colors[row] if row < len(row_colors) else HEADER_COLOR
+            for row in range(first_row, end_row)
+        )
+        self._chrome.layer(
+            'frame', self.rect,
+            lambda layer: self._render_frame(layer, window, visible_colors),
+            key=(window, self.cell_size, self.scroll_row, self.scroll_col, visible_colors)
+        )
+        surface.set_clip(self.rect.clip(surface.get_clip()))
+        self._chrome.draw(surface)
+        
+        body = self.body
+        surface.set_clip(body.clip(surface.get_clip()))
+        
+        # Highlight the current cell over the cells it is compared with
+        for (row, col), color in _highlights(current_cell, highlighted_cells):
+            if self._in_window(row, col, window):
+                cell_rect = self.cell_rect(row, col)
+                pygame.draw.rect(surface, color, cell_rect)
+                pygame.draw.rect(surface, GRID_COLOR, cell_rect, 1)
+        
+        # Values
+        first_row, end_row, first_col, end_col = window
+        size = self._font_size()
+        blits = []
+        for row in range(first_row, end_row):
+            values = dp_table[row]
+            for col in range(first_col, min(end_col, len(values))):
+                text = render_text(str(values[col]), size, GRID_COLOR)
+                blits.append((text, text.get_rect(center=self.cell_rect(row, col).center)))
+        surface.blits(blits, False)
+    
+    def _render_frame(self, layer, window, visible_colors):
+        """Draw headers and the empty cell grid onto a layer surface."""
+        first_row, end_row, first_col, end_col = window
+        offset = (-self.rect.x, -self.rect.y)
+        size = self._font_size()
+        
+        header_row = pygame.Rect(HEADER_SIZE, 0, self.rect.width - HEADER_SIZE, HEADER_SIZE)
+        header_col = pygame.Rect(0, HEADER_SIZE, HEADER_SIZE, self.rect.height - HEADER_SIZE)
+        
+        # Column headers (weights)
+        layer.set_clip(header_row)
+        for col in range(first_col, end_col):
+            cell = self.cell_rect(0, col).move(offset)
+            cell.top, cell.height = 0, HEADER_SIZE
+            pygame.draw.rect(layer, HEADER_COLOR, cell)
+            text = render_text(str(col), size, GRID_COLOR)
+            layer.blit(text, text.get_rect(center=cell.center))
+        
+        # Row headers (items)
+        layer.set_clip(header_col)
+        for row, color in zip(range(first_row, end_row), visible_colors):
+            cell = self.cell_rect(row, 0).move(offset)
+            cell.left, cell.width = 0, HEADER_SIZE
+            pygame.draw.rect(layer, color, cell)
+            text = render_text(str(row), size, GRID_COLOR)
+            layer.blit(text, text.get_rect(center=cell.center))
+        
+        # Empty cells
+        layer.set_clip(self.body.move(offset))
+        for row in range(first_row, end_row):
+            for col in range(first_col, end_col):
+                cell = self.cell_rect(row, col).move(offset)
+                pygame.draw.rect(layer, CELL_COLOR, cell)
+                pygame.draw.rect(layer, GRID_COLOR, cell, 1)
+        layer.set_clip(None)
+    
+    def _draw_heatmap(self, surface, dp_table, current_cell, highlighted_cells):
+        """Draw the visible window as one scaled heatmap surface."""
+        window = self.visible_window()
+        first_row, end_row, first_col, end_col = window
+        body = self.body
+        
+        key = (self.table_version, id(dp_table), window, self.cell_size, body.size)
+        if key != self._heatmap_key:
+            self._heatmap = self._build_heatmap(dp_table, window)
+            self._heatmap_key = key
+        
+        # Headers only show the visible range when cells are this small
+        pygame.draw.rect(surface, HEADER_COLOR, (self.rect.x, self.rect.y, self.rect.width, HEADER_SIZE))
+        pygame.draw.rect(surface, HEADER_COLOR, (self.rect.x, body.y, HEADER_SIZE, body.height))
+        text = render_text(f"Capacity {first_col}-{end_col - 1}", 20, GRID_COLOR)
+        surface.blit(text, text.get_rect(midleft=(body.x + 5, self.rect.y + HEADER_SIZE // 2)))
+        text = render_text(str(first_row), 20, GRID_COLOR)
+        surface.blit(text, text.get_rect(topleft=(self.rect.x + 5, body.top + 5)))
+        text = render_text(str(end_row - 1), 20, GRID_COLOR)
+        surface.blit(text, text.get_rect(bottomleft=(self.rect.x + 5, body.bottom - 5)))
+        
+        surface.set_clip(body.clip(surface.get_clip()))
+        top_left = self.cell_rect(first_row, first_col)
+        bottom_right = self.cell_rect(end_row - 1, end_col - 1)
+        size = (max(1, bottom_right.right - top_left.x), max(1, bottom_right.bottom - top_left.y))
+        surface.blit(pygame.transform.scale(self._heatmap, size), top_left.topleft)
+        
+        # Markers are kept at least a few pixels wide so they stay visible
+        for (row, col), color in _highlights(current_cell, highlighted_cells):
+            if self._in_window(row, col, window):
+                marker = self.cell_rect(row, col)
+                marker.inflate_ip(max(0, 6 - marker.width), max(0, 6 - marker.height))
+                pygame.draw.rect(surface, GRID_COLOR, marker, 1)
+                pygame.draw.rect(surface, color, marker.inflate(-2, -2))
+    
+    def _build_heatmap(self, dp_table, window):
+        """Sample the window (at most one cell per pixel) into a small surface."""
+        first_row, end_row, first_col, end_col = window
+        body = self.body
+        rows = _sample(first_row, end_row, body.height)
+        cols = _sample(first_col, end_col, body.width)
+        
+        if isinstance(dp_table, np.ndarray):
+            values = dp_table[np.ix_(rows, cols)]
+        else:
+            values = np.array([dp_table[row] for row in rows])[:, cols]
+        values = values.astype(np.float32)
+        
+        peak = values.max()
+        shade = values / peak if peak > 0 else values
+        pixels = HEATMAP_LOW + shade[..., None] * (HEATMAP_HIGH - HEATMAP_LOW)
+        # surfarray is indexed [x][y]
+        return pygame.surfarray.make_surface(pixels.astype(np.uint8).transpose(1, 0, 2))
+    
+    @staticmethod
+    def _in_window(row, col, window):
+        first_row, end_row, first_col, end_col = window
+        return first_row <= row < end_row and first_col <= col < end_col
+
+def _highlights(current_cell, highlighted_cells):
+    """Cells to highlight with their colors, the current cell drawn last."""
+    highlights = [(cell, HIGHLIGHT_COLOR) for cell in highlighted_cells]
+    if current_cell is not None:
+        highlights.append((current_cell, CURRENT_COLOR))
+    return highlights
+
+def _sample(start, end, pixels):
+    """Indices in [start, end), thinned out to at most one per pixel."""
+    count = end - start
+    if count <= pixels:
+        return np.arange(start, end)
+    return np.linspace(start, end - 1, max(1, pixels)).astype(np.intp)
@@ -5,14 +5,28 @@ This module contains both the algorithm implementation and visualization state t
 
 import math
 from dataclasses import dataclass
-from typing import List, Tuple, Optional
+from operator import attrgetter
+from typing import Generator, Iterator, List, Tuple, Optional
 
-@dataclass
+import numpy as np
+
+@dataclass(frozen=True)
 class Point:
-    """Represents a point (treasure) in 2D space."""
+    """Represents a point (treasure) in 2D space. Immutable, with a cached hash."""
+    __slots__ = ('x', 'y', '_hash')
     x: float
     y: float
     
+    def __post_init__(self):
+        object.__setattr__(self, '_hash', hash((self.x, self.y)))
+    
+    def __hash__(self):
+        return self._hash
+    
+    def __reduce__(self):
+        # Frozen slotted instances cannot be restored attribute by attribute
+        return (Point, (self.x, self.y))
+    
     def distance_to(self, other: 'Point') -> float:
         """Calculate Euclidean distance to another point."""
         return math.sqrt((self.x - other.x)**2 + (self.y - other.y)**2)
@@ -34,85 +48,216 @@ class VisualizationState:
         self.completed = False
         self.step_description = ""
 
-def closest_pair_recursive(points: List[Point], viz_state: VisualizationState) -> ClosestPairResult:
+_by_y = attrgetter('y')
+
+def _run_steps(steps: Iterator[VisualizationState]):
+    """Drive a step generator to completion and return its result."""
+    while True:
+        try:
+            next(steps)
+        except StopIteration as done:
+            return done.value
+
+def closest_pair_recursive(points: List[Point],
+                           viz_state: Optional[VisualizationState] = None) -> ClosestPairResult:
     """
     Find the closest pair of points using divide and conquer.
     
+    Points are sorted by x once up front; each recursive call then returns its
+    points sorted by y, which the parent merges instead of re-sorting. This
+    keeps the whole algorithm at O(n log n).
+    
     Args:
         points: List of points to process
-        viz_state: Current visualization state to update
+        viz_state: Optional visualization state to update. Without one the
+            algorithm runs headless, with no tracing at all.
         
     Returns:
         ClosestPairResult containing the closest pair and their distance
     """
-    n = len(points)
+    if viz_state is not None:
+        return _run_steps(closest_pair_steps(points, viz_state))
+    
+    if len(points) < 2:
+        return None
+    points_by_x = sorted(points, key=lambda p: (p.x, p.y))
+    best_sq, p1, p2, _ = _run_steps(_closest_pair_presorted(points_by_x, 0, len(points_by_x), None))
+    return ClosestPairResult(p1, p2, math.sqrt(best_sq))
+
+def closest_pair_steps(points: List[Point], viz_state: VisualizationState
+                       ) -> Generator[VisualizationState, None, ClosestPairResult]:
+    """
+    Step-by-step version of closest_pair_recursive.
     
-    # Base cases
-    if n <= 1:
+    Args:
+        points: List of points to process
+        viz_state: Current visualization state to update
+        
+    Yields:
+        viz_state after each division, strip update and comparison
+        
+    Returns:
+        ClosestPairResult containing the closest pair and their distance
+    """
+    if len(points) < 2:
+        viz_state.completed = True
         return None
-    if n == 2:
-        dist = points[0].distance_to(points[1])
-        return ClosestPairResult(points[0], points[1], dist)
     
-    # Sort points by x coordinate
-    points_sorted = sorted(points, key=lambda p: p.x)
-    mid = n // 2
-    mid_x = points_sorted[mid].x
+    # Sort points by x coordinate (only once)
+    points_by_x = sorted(points, key=lambda p: (p.x, p.y))
+    best_sq, p1, p2, _ = yield from _closest_pair_presorted(
+        points_by_x, 0, len(points_by_x), viz_state)
+    
+    viz_state.current_points = []
+    viz_state.current_pair = (p1, p2)
+    viz_state.completed = True
+    return ClosestPairResult(p1, p2, math.sqrt(best_sq))
+
+def _closest_pair_presorted(points_by_x: List[Point], lo: int, hi: int,
+                            viz_state: Optional[VisualizationState]
+                            ) -> Generator[VisualizationState, None, Tuple[float, Point, Point, List[Point]]]:
+    """
+    Recursive step over points_by_x[lo:hi].
+    
+    Without a viz_state nothing is yielded or recorded, so driving the
+    generator runs the whole recursion in one step.
+    
+    Returns:
+        (squared distance, point1, point2, points of the range sorted by y)
+    """
+    trace = viz_state is not None
+    n = hi - lo
+    
+    # Base case: brute force small ranges
+    if n <= 3:
+        best_sq = float('inf')
+        p1 = p2 = None
+        for i in range(lo, hi):
+            a = points_by_x[i]
+            for j in range(i + 1, hi):
+                b = points_by_x[j]
+                if trace:
+                    viz_state.current_points = [a, b]
+                    yield viz_state
+                
+                dx = a.x - b.x
+                dy = a.y - b.y
+                dist_sq = dx * dx + dy * dy
+                if dist_sq < best_sq:
+                    best_sq, p1, p2 = dist_sq, a, b
+        return best_sq, p1, p2, sorted(points_by_x[lo:hi], key=_by_y)
+    
+    mid = lo + n // 2
+    mid_x = points_by_x[mid].x
     
     # Add dividing line to visualization
-    viz_state.dividing_lines.append((mid_x, 0, mid_x, 1000))  # Assuming 1000 is max height
+    if trace:
+        viz_state.dividing_lines.append((mid_x, 0, mid_x, 1000))  # Assuming 1000 is max height
+        yield viz_state
     
     # Recursively solve left and right halves
-    left_result = closest_pair_recursive(points_sorted[:mid], viz_state)
-    right_result = closest_pair_recursive(points_sorted[mid:], viz_state)
+    left_sq, l1, l2, left_by_y = yield from _closest_pair_presorted(points_by_x, lo, mid, viz_state)
+    right_sq, r1, r2, right_by_y = yield from _closest_pair_presorted(points_by_x, mid, hi, viz_state)
     
     # Find minimum distance from recursive results
-    if left_result is None:
-        min_result = right_result
-    elif right_result is None:
-        min_result = left_result
+    if left_sq <= right_sq:
+        best_sq, p1, p2 = left_sq, l1, l2
     else:
-        min_result = left_result if left_result.distance < right_result.distance else right_result
-    
-    if min_result is None:
-        return None
+        best_sq, p1, p2 = right_sq, r1, r2
     
-    # Find points in strip around dividing line
-    strip_width = min_result.distance
-    strip_points = [p for p in points_sorted 
-                   if abs(p.x - mid_x) < strip_width]
+    points_by_y = _merge_by_y(left_by_y, right_by_y)
+    strip_width = math.sqrt(best_sq)
+    strip_points = _strip_points(points_by_y, mid_x, strip_width)
     
     # Update visualization state for strip
-    viz_state.strip_bounds = (mid_x - strip_width, mid_x + strip_width)
+    if trace:
+        viz_state.strip_bounds = (mid_x - strip_width, mid_x + strip_width)
+        yield viz_state
     
     # Check points in strip
-    strip_points.sort(key=lambda p: p.y)  # Sort by y coordinate
-    for i in range(len(strip_points)):
+    count = len(strip_points)
+    for i in range(count):
+        a = strip_points[i]
         # Only need to check 7 points ahead (proof in algorithm analysis)
-        for j in range(i + 1, min(i + 8, len(strip_points))):
+        for j in range(i + 1, min(i + 8, count)):
+            b = strip_points[j]
+            dy = b.y - a.y
+            if dy * dy >= best_sq:
+                break
+            
             # Update visualization state
-            viz_state.current_points = [strip_points[i], strip_points[j]]
+            if trace:
+                viz_state.current_points = [a, b]
+                yield viz_state
             
-            dist = strip_points[i].distance_to(strip_points[j])
-            if dist < min_result.distance:
-                min_result = ClosestPairResult(strip_points[i], strip_points[j], dist)
-                viz_state.current_pair = (strip_points[i], strip_points[j])
+            dx = b.x - a.x
+            dist_sq = dx * dx + dy * dy
+            if dist_sq < best_sq:
+                best_sq, p1, p2 = dist_sq, a, b
+                if trace:
+                    viz_state.current_pair = (a, b)
     
-    return min_result
+    return best_sq, p1, p2, points_by_y
+
+def _merge_by_y(left_by_y: List[Point], right_by_y: List[Point]) -> List[Point]:
+    """
+    Merge two y-sorted lists. Timsort detects the two sorted runs and merges
+    them in linear time.
+    """
+    points_by_y = left_by_y + right_by_y
+    points_by_y.sort(key=_by_y)
+    return points_by_y
+
+def _strip_points(points_by_y: List[Point], mid_x: float, strip_width: float) -> List[Point]:
+    """Points closer than strip_width to the dividing line, still sorted by y."""
+    left_x, right_x = mid_x - strip_width, mid_x + strip_width
+    return [p for p in points_by_y if left_x < p.x < right_x]
 
-def brute_force(points: List[Point], viz_state: VisualizationState) -> ClosestPairResult:
+def brute_force(points: List[Point],
+                viz_state: Optional[VisualizationState] = None) -> ClosestPairResult:
     """
     Find closest pair using brute force approach (for comparison).
     
     Args:
         points: List of points to process
-        viz_state: Current visualization state to update
+        viz_state: Optional visualization state to update. Without one the
+            algorithm runs headless, with no tracing at all.
         
     Returns:
         ClosestPairResult containing the closest pair and their distance
     """
+    if viz_state is not None:
+        return _run_steps(brute_force_steps(points, viz_state))
+    
     if len(points) < 2:
         return None
+    
+    best_sq = float('inf')
+    p1 = p2 = None
+    for i, a in enumerate(points):
+        ax, ay = a.x, a.y
+        for b in points[i + 1:]:
+            dx = b.x - ax
+            dy = b.y - ay
+            dist_sq = dx * dx + dy * dy
+            if dist_sq < best_sq:
+                best_sq, p1, p2 = dist_sq, a, b
+    return ClosestPairResult(p1, p2, math.sqrt(best_sq))
+
+def brute_force_steps(points: List[Point], viz_state: VisualizationState
+                      ) -> Generator[VisualizationState, None, ClosestPairResult]:
+    """
+    Step-by-step version of brute_force.
+    
+    Yields:
+        viz_state after each comparison
+        
+    Returns:
+        ClosestPairResult containing the closest pair and their distance
+    """
+    if len(points) < 2:
+        viz_state.completed = True
+        return None
         
     min_dist = float('inf')
     result = None
@@ -121,6 +266,7 @@ def brute_force(points: List[Point], viz_state: VisualizationState) -> ClosestPa
         for j in range(i + 1, len(points)):
             # Update visualization state
             viz_state.current_points = [points[i], points[j]]
+            yield viz_state
             
             dist = points[i].distance_to(points[j])
             if dist < min_dist:
@@ -128,4 +274,163 @@ def brute_force(points: List[Point], viz_state: VisualizationState) -> ClosestPa
                 result = ClosestPairResult(points[i], points[j], dist)
                 viz_state.current_pair = (points[i], points[j])
     
-    return result 
\ No newline at end of file
+    viz_state.current_points = []
+    viz_state.completed = True
+    return result
+
+# Ranges at or below this size are solved with one batched distance matrix
+NUMPY_LEAF_SIZE = 64
+_LOWER_TRIANGLE = np.tri(NUMPY_LEAF_SIZE, dtype=bool)
+
+def points_to_array(points: List[Point]) -> np.ndarray:
+    """Convert a list of points to an (n, 2) float array."""
+    return np.array([(p.x, p.y) for p in points], dtype=np.float64).reshape(-1, 2)
+
+class PointColumns:
+    """
+    Points stored as one array of x and one of y coordinates.
+    
+    Takes 16 bytes per point instead of a Point object per point, and can be
+    passed straight to closest_pair_numpy.
+    """
+    
+    def __init__(self, x: np.ndarray, y: np.ndarray):
+        """
+        Args:
+            x: X coordinates
+            y: Y coordinates, as many as x
+        """
+        self.x = np.asarray(x, dtype=np.float64)
+        self.y = np.asarray(y, dtype=np.float64)
+        if self.x.shape != self.y.shape or self.x.ndim != 1:
+            raise ValueError(f"Expected two equally long 1-D arrays, got shapes "
+                             f"{self.x.shape} and {self.y.shape}")
+    
+    @classmethod
+    def from_points(cls, points: List[Point]) -> 'PointColumns':
+        """Copy the coordinates of a list of points."""
+        x = np.fromiter((p.x for p in points), dtype=np.float64, count=len(points))
+        y = np.fromiter((p.y for p in points), dtype=np.float64, count=len(points))
+        return cls(x, y)
+    
+    def __len__(self) -> int:
+        return len(self.x)
+    
+    def __getitem__(self, index: int) -> Point:
+        return Point(float(self.x[index]), float(self.y[index]))
+
+def _coordinate_columns(coords) -> Tuple[np.ndarray, np.ndarray]:
+    """Get the x and y columns of PointColumns or of an (n, 2) array."""
+    if isinstance(coords, PointColumns):
+        return coords.x, coords.y
+    coords = np.asarray(coords, dtype=np.float64)
+    if coords.ndim != 2 or coords.shape[1] != 2:
+        raise ValueError(f"Expected an (n, 2) array, got shape {coords.shape}")
+    return coords[:, 0], coords[:, 1]
+
+def closest_pair_numpy(coords,
+                       viz_state: Optional[VisualizationState] = None) -> ClosestPairResult:
+    """
+    Find the closest pair of points with an array-backed divide and conquer.
+    
+    Leaf ranges and strip scans are done as batched squared-distance
+    operations; the square root is only taken for the final answer.
+    
+    Args:
+        coords: PointColumns, or an array of shape (n, 2) holding x and y
+            coordinates
+        viz_state: Optional visualization state to update with the
+            dividing lines and the final pair
+        
+    Returns:
+        ClosestPairResult containing the closest pair and their distance
+    """
+    xs, ys = _coordinate_columns(coords)
+    if len(xs) < 2:
+        return None
+    
+    # Sort by x once; all recursion works on positions in this order
+    order = np.lexsort((ys, xs))
+    points_by_x = np.column_stack((xs[order], ys[order]))
+    by_y = np.argsort(points_by_x[:, 1], kind='stable')
+    
+    dividing_lines = [] if viz_state is not None else None
+    best_sq, i, j = _closest_pair_numpy(points_by_x, 0, len(points_by_x), by_y, dividing_lines)
+    
+    p1 = Point(float(xs[order[i]]), float(ys[order[i]]))
+    p2 = Point(float(xs[order[j]]), float(ys[order[j]]))
+    if viz_state is not None:
+        viz_state.dividing_lines.extend(dividing_lines)
+        viz_state.current_pair = (p1, p2)
+    return ClosestPairResult(p1, p2, math.sqrt(best_sq))
+
+def _closest_pair_numpy(points_by_x: np.ndarray, lo: int, hi: int, by_y: np.ndarray,
+                        dividing_lines: Optional[list]) -> Tuple[float, int, int]:
+    """
+    Recursive step over points_by_x[lo:hi].
+    
+    Args:
+        by_y: Positions in [lo, hi) ordered by y coordinate
+        
+    Returns:
+        (squared distance, position1, position2)
+    """
+    n = hi - lo
+    
+    # Leaf: compare every pair in one batched operation
+    if n <= NUMPY_LEAF_SIZE:
+        block = points_by_x[lo:hi]
+        diff = block[:, None, :] - block[None, :, :]
+        dist_sq = np.einsum('ijk,ijk->ij', diff, diff)
+        dist_sq[_LOWER_TRIANGLE[:n, :n]] = np.inf
+        flat = int(np.argmin(dist_sq))
+        i, j = divmod(flat, n)
+        return float(dist_sq[i, j]), lo + i, lo + j
+    
+    mid = lo + n // 2
+    mid_x = points_by_x[mid, 0]
+    if dividing_lines is not None:
+        dividing_lines.append((float(mid_x), 0, float(mid_x), 1000))
+    
+    # Split the y-ordered positions without re-sorting
+    in_left = by_y < mid
+    left = _closest_pair_numpy(points_by_x, lo, mid, by_y[in_left], dividing_lines)
+    right = _closest_pair_numpy(points_by_x, mid, hi, by_y[~in_left], dividing_lines)
+    best_sq, i, j = left if left[0] <= right[0] else right
+    if best_sq == 0.0:
+        return best_sq, i, j
+    
+    # Points in the strip, still ordered by y
+    dx = points_by_x[by_y, 0] - mid_x
+    strip = by_y[dx * dx < best_sq]
+    return _scan_strip(points_by_x, strip, (best_sq, i, j))
+
+def _scan_strip(points_by_x: np.ndarray, strip: np.ndarray,
+                best: Tuple[float, int, int]) -> Tuple[float, int, int]:
+    """
+    Improve on the best pair of two halves with the pairs crossing the divide.
+    
+    Args:
+        strip: Positions within the best distance of the divide, ordered by y
+        best: (squared distance, position1, position2) of the halves
+        
+    Returns:
+        (squared distance, position1, position2)
+    """
+    best_sq, i, j = best
+    strip_points = points_by_x[strip]
+    
+    # Compare each strip point with the next 7 in one batched operation
+    m = len(strip)
+    if m > 1:
+        ahead = min(7, m - 1)
+        padded = np.full((m + ahead, 2), np.inf)
+        padded[:m] = strip_points
+        neighbours = np.arange(m)[:, None] + np.arange(1, ahead + 1)
+        diff = padded[neighbours] - strip_points[:, None, :]
+        dist_sq = np.einsum('ijk,ijk->ij', diff, diff)
+        a, k = divmod(int(np.argmin(dist_sq)), ahead)
+        if dist_sq[a, k] < best_sq:
+            best_sq, i, j = float(dist_sq[a, k]), int(strip[a]), int(strip[a + k + 1])
+    
+    return best_sq, i, j
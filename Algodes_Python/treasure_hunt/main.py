@@ -5,7 +5,6 @@ Handles game initialization, rendering, and user interaction.
 
 import os
 import sys
-import math
 import pygame
 import pygame_gui
 
@@ -13,8 +12,11 @@ import pygame_gui
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from common.game_base import GameBase
-from common.viz_utils import create_tooltip
-from closest_pair import Point, VisualizationState, closest_pair_recursive, brute_force
+from common.layers import LayerCompositor
+from common.viz_utils import create_tooltip, draw_grid
+from closest_pair import Point, VisualizationState, closest_pair_steps, brute_force_steps
+from spatial_index import SpatialIndex
+from point_renderer import PointRenderer, SegmentLayer
 
 def create_treasure_surface(size):
     """Create a surface with a simple treasure chest drawing."""
@@ -46,13 +48,14 @@ def create_treasure_surface(size):
     return surface
 
 class TreasureHuntGame(GameBase):
-    def __init__(self):
-        super().__init__("Treasure Hunt - Closest Pair Algorithm")
+    def __init__(self, headless=False):
+        super().__init__("Treasure Hunt - Closest Pair Algorithm", headless=headless)
         
         # Game state
-        self.points = []  # List of treasure points
+        self.points = SpatialIndex(cell_size=50)  # Treasure points
         self.viz_state = VisualizationState()
         self.algorithm_running = False
+        self.algorithm_steps = None  # Step generator of the running algorithm
         self.use_brute_force = False
         self.visualization_speed = 1.0  # Seconds per step
         self.step_timer = 0
@@ -60,9 +63,23 @@ class TreasureHuntGame(GameBase):
         # Create treasure surface
         self.treasure_img = create_treasure_surface((30, 30))
         
+        # Batched drawing of points, dividing lines and comparison circles
+        play_area = (self.width - 250, self.height)
+        self.point_renderer = PointRenderer(play_area, self.treasure_img, self.points)
+        self.dividing_line_layer = SegmentLayer(play_area, self.RED, 2)
+        self.comparison_ring = pygame.Surface((41, 41), pygame.SRCALPHA)
+        pygame.draw.circle(self.comparison_ring, self.GREEN, (20, 20), 20, 2)
+        
         # Create UI elements
         self.setup_ui()
         
+        # Only redraw what the algorithm steps and input change
+        self.dirty_rects_enabled = True
+        self.play_area = pygame.Rect(0, 0, self.width - 250, self.height)
+        
+        # Pre-rendered static scenery
+        self.background = LayerCompositor()
+        
         # Tutorial state
         self.show_tutorial = True
         self.tutorial_step = 0
@@ -189,17 +206,21 @@ class TreasureHuntGame(GameBase):
             # Left click to add point
             x, y = event.pos
             if x < self.width - 250:  # Not in control panel
-                self.points.append(Point(x, y))
+                point = Point(x, y)
+                self.points.insert(point)
+                self.point_renderer.add(point)
                 self.points_label.set_text(f"Points: {len(self.points)}")
+                self.mark_dirty(self.play_area)
         
         elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 3:
             # Right click to remove point
             x, y = event.pos
-            for point in self.points:
-                if math.sqrt((x - point.x)**2 + (y - point.y)**2) < 15:
-                    self.points.remove(point)
-                    self.points_label.set_text(f"Points: {len(self.points)}")
-                    break
+            point = self.points.nearest(x, y, max_distance=15)
+            if point is not None:
+                self.points.remove(point)
+                self.point_renderer.remove(point)
+                self.points_label.set_text(f"Points: {len(self.points)}")
+                self.mark_dirty(self.play_area)
         
         elif event.type == pygame.KEYDOWN:
             if event.key == pygame.K_SPACE:
@@ -239,21 +260,28 @@ class TreasureHuntGame(GameBase):
             p1, p2 = self.viz_state.current_pair
             dist = p1.distance_to(p2)
             self.distance_label.set_text(f"Min Distance: {dist:.1f}")
+        elif not self.algorithm_running and len(self.points) >= 2:
+            # Kept up to date by the spatial index as points change
+            dist = self.points.closest_pair().distance
+            self.distance_label.set_text(f"Min Distance: {dist:.1f}")
         else:
             self.distance_label.set_text("Min Distance: -")
     
     def draw(self):
         """Draw game elements."""
-        # Draw grid
-        for x in range(0, self.width - 250, 50):
-            pygame.draw.line(self.screen, self.GRAY, (x, 0), (x, self.height), 1)
-        for y in range(0, self.height, 50):
-            pygame.draw.line(self.screen, self.GRAY, (0, y), (self.width - 250, y), 1)
+        # Everything but the UI is in the play area
+        if not self.needs_redraw(self.play_area):
+            return
+        
+        # Draw grid (pre-rendered, only redrawn when the play area changes size)
+        self.background.layer(
+            'grid', self.play_area,
+            lambda surface: draw_grid(surface, 50, self.GRAY)
+        )
+        self.background.draw(self.screen)
         
-        # Draw dividing lines
-        for line in self.viz_state.dividing_lines:
-            x1, y1, x2, y2 = line
-            pygame.draw.line(self.screen, self.RED, (x1, y1), (x2, y2), 2)
+        # Draw dividing lines (only new ones are rendered each frame)
+        self.dividing_line_layer.draw(self.screen, self.viz_state.dividing_lines)
         
         # Draw strip bounds if present
         if self.viz_state.strip_bounds:
@@ -262,9 +290,10 @@ class TreasureHuntGame(GameBase):
                            (left, 0, right - left, self.height), 1)
         
         # Draw points being compared
-        for point in self.viz_state.current_points:
-            pygame.draw.circle(self.screen, self.GREEN, 
-                             (int(point.x), int(point.y)), 20, 2)
+        self.screen.blits([
+            (self.comparison_ring, (int(point.x) - 20, int(point.y) - 20))
+            for point in self.viz_state.current_points
+        ], False)
         
         # Draw current closest pair
         if self.viz_state.current_pair:
@@ -272,12 +301,8 @@ class TreasureHuntGame(GameBase):
             pygame.draw.line(self.screen, self.BLUE, 
                            (p1.x, p1.y), (p2.x, p2.y), 2)
         
-        # Draw all points (treasures)
-        for point in self.points:
-            self.screen.blit(
-                self.treasure_img,
-                (point.x - 15, point.y - 15)
-            )
+        # Draw all points (treasures), or their density when they pile up
+        self.point_renderer.draw(self.screen)
         
         # Draw tutorial if active
         if self.show_tutorial and self.tutorial_step < len(self.tutorial_messages):
@@ -298,34 +323,49 @@ class TreasureHuntGame(GameBase):
         self.algorithm_running = not self.algorithm_running
         if self.algorithm_running:
             self.viz_state = VisualizationState()
+            self.mark_dirty(self.play_area)
+            points = list(self.points)
+            if self.use_brute_force:
+                self.algorithm_steps = brute_force_steps(points, self.viz_state)
+            else:
+                self.algorithm_steps = closest_pair_steps(points, self.viz_state)
             self.start_button.set_text("Stop Algorithm")
         else:
             self.start_button.set_text("Start Algorithm")
     
     def reset_game(self):
         """Reset the game state."""
-        self.points = []
+        self.points.clear()
+        self.point_renderer.clear()
         self.viz_state = VisualizationState()
         self.algorithm_running = False
+        self.algorithm_steps = None
         self.start_button.set_text("Start Algorithm")
         self.points_label.set_text("Points: 0")
         self.distance_label.set_text("Min Distance: -")
+        self.mark_dirty(self.play_area)
     
     def update_algorithm(self):
         """Update algorithm visualization state."""
         if not self.algorithm_running:
             return
             
-        # Run appropriate algorithm
-        if self.use_brute_force:
-            result = brute_force(self.points, self.viz_state)
-        else:
-            result = closest_pair_recursive(self.points, self.viz_state)
-        
-        if result:
+        # Advance the algorithm by a single step
+        try:
+            next(self.algorithm_steps)
+        except StopIteration:
+            self.mark_dirty(self.play_area)
             self.viz_state.completed = True
             self.algorithm_running = False
+            self.algorithm_steps = None
             self.start_button.set_text("Start Algorithm")
+            return
+        
+        self.mark_dirty(self.play_area)
+    
+    def is_animating(self):
+        """Frames are only needed while the algorithm is running."""
+        return self.algorithm_running
 
 if __name__ == "__main__":
     game = TreasureHuntGame()
@@ -0,0 +1,128 @@
+"""
+Closest pair on multiple cores.
+The top levels of the divide and conquer recursion are fanned out to a
+process pool. Workers read the sorted points from shared memory instead of
+receiving pickled copies, and the strip merges of the top levels run in the
+parent.
+"""
+
+import math
+import multiprocessing
+import os
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from closest_pair import (
+    Point, ClosestPairResult, NUMPY_LEAF_SIZE, closest_pair_numpy, _closest_pair_numpy,
+    _coordinate_columns, _scan_strip
+)
+
+# Below this many points the pool costs more than it saves
+PARALLEL_MIN_POINTS = 200_000
+TASKS_PER_WORKER = 4  # Extra splits even out unequal worker speeds
+
+def _solve_range(shm_name: str, n: int, lo: int, hi: int) -> Tuple[float, int, int]:
+    """
+    Solve points_by_x[lo:hi] from the shared array. Runs in the worker processes.
+    
+    Returns:
+        (squared distance, position1, position2)
+    """
+    shm = shared_memory.SharedMemory(name=shm_name)
+    points_by_x = np.ndarray((n, 2), dtype=np.float64, buffer=shm.buf)
+    try:
+        by_y = lo + np.argsort(points_by_x[lo:hi, 1], kind='stable')
+        return _closest_pair_numpy(points_by_x, lo, hi, by_y, None)
+    finally:
+        del points_by_x
+        shm.close()
+
+def _split(lo: int, hi: int, levels: int) -> List[Tuple[int, int]]:
+    """Ranges at the bottom of the top recursion levels, split like _closest_pair_numpy."""
+    if levels == 0 or hi - lo <= NUMPY_LEAF_SIZE:
+        return [(lo, hi)]
+    mid = lo + (hi - lo) // 2
+    return _split(lo, mid, levels - 1) + _split(mid, hi, levels - 1)
+
+def _merge(points_by_x: np.ndarray, xs: np.ndarray, lo: int, hi: int,
+           solved: Dict[Tuple[int, int], Tuple[float, int, int]]) -> Tuple[float, int, int]:
+    """
+    Combine the solved ranges below [lo, hi) with strip merges.
+    
+    The strip is found by bisecting the x coordinates, so no y ordering of
+    the whole range is needed.
+    """
+    if (lo, hi) in solved:
+        return solved[(lo, hi)]
+    
+    mid = lo + (hi - lo) // 2
+    mid_x = points_by_x[mid, 0]
+    left = _merge(points_by_x, xs, lo, mid, solved)
+    right = _merge(points_by_x, xs, mid, hi, solved)
+    best_sq, i, j = left if left[0] <= right[0] else right
+    if best_sq == 0.0:
+        return best_sq, i, j
+    
+    # Candidates within the best distance of the divide, then the exact test
+    # _closest_pair_numpy applies, in the same y order
+    d = math.sqrt(best_sq)
+    start = lo + int(np.searchsorted(xs[lo:hi], mid_x - d, 'left'))
+    end = lo + int(np.searchsorted(xs[lo:hi], mid_x + d, 'right'))
+    candidates = start + np.argsort(points_by_x[start:end, 1], kind='stable')
+    dx = points_by_x[candidates, 0] - mid_x
+    strip = candidates[dx * dx < best_sq]
+    return _scan_strip(points_by_x, strip, (best_sq, i, j))
+
+def closest_pair_parallel(coords, workers: Optional[int] = None) -> ClosestPairResult:
+    """
+    Find the closest pair of points using several processes.
+    
+    The recursion is split into about TASKS_PER_WORKER ranges per worker.
+    Each worker solves its ranges with the same array-backed recursion as
+    closest_pair_numpy, and the parent merges the results. Small inputs, or
+    a single worker, fall back to closest_pair_numpy.
+    
+    Args:
+        coords: PointColumns, or an array of shape (n, 2) holding x and y
+            coordinates
+        workers: Number of worker processes; defaults to the CPU count
+    
+    Returns:
+        ClosestPairResult containing the closest pair and their distance
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError("At least one worker is needed")
+    
+    xs, ys = _coordinate_columns(coords)
+    n = len(xs)
+    if workers == 1 or n < PARALLEL_MIN_POINTS:
+        return closest_pair_numpy(coords)
+    
+    # Sort by x straight into shared memory
+    order = np.lexsort((ys, xs))
+    shm = shared_memory.SharedMemory(create=True, size=n * 2 * 8)
+    points_by_x = np.ndarray((n, 2), dtype=np.float64, buffer=shm.buf)
+    try:
+        np.take(xs, order, out=points_by_x[:, 0])
+        np.take(ys, order, out=points_by_x[:, 1])
+        sorted_xs = np.ascontiguousarray(points_by_x[:, 0])
+        
+        levels = math.ceil(math.log2(workers * TASKS_PER_WORKER))
+        ranges = _split(0, n, levels)
+        with multiprocessing.Pool(min(workers, len(ranges))) as pool:
+            results = pool.starmap(_solve_range, [(shm.name, n, lo, hi) for lo, hi in ranges])
+        
+        best_sq, i, j = _merge(points_by_x, sorted_xs, 0, n, dict(zip(ranges, results)))
+    finally:
+        # The view must go before the shared block can be closed
+        del points_by_x
+        shm.close()
+        shm.unlink()
+    
+    p1 = Point(float(xs[order[i]]), float(ys[order[i]]))
+    p2 = Point(float(xs[order[j]]), float(ys[order[j]]))
+    return ClosestPairResult(p1, p2, math.sqrt(best_sq))
@@ -0,0 +1,171 @@
+"""
+Batched drawing for large treasure sets.
+Point sprites live on a pre-rendered layer that is patched on every insert
+and delete, so a frame costs one blit however many points there are. When
+sprites pile up too densely to tell apart, points are drawn as a density
+map instead.
+"""
+
+import math
+
+import numpy as np
+import pygame
+
+# Switch to the density map when sprites would cover the play area this many times over
+DENSITY_COVERAGE = 4.0
+DENSITY_BIN_SIZE = 4  # Pixels per density map bin
+DENSITY_COLOR = (139, 69, 19)  # Brown, like the chest sprite
+
+class PointRenderer:
+    """
+    Keeps a drawing of every point in a SpatialIndex up to date.
+    
+    Call add() after inserting a point into the index and remove() after
+    removing one.
+    """
+    
+    def __init__(self, size, sprite, points):
+        """
+        Args:
+            size (tuple): Width and height of the play area
+            sprite (pygame.Surface): Image drawn centred on each point
+            points (SpatialIndex): Index holding the points
+        """
+        self.size = size
+        self.sprite = sprite
+        self.points = points
+        self._half_w = sprite.get_width() // 2
+        self._half_h = sprite.get_height() // 2
+        
+        self._layer = pygame.Surface(size, pygame.SRCALPHA)
+        self._layer_valid = True  # False while the sprite layer is out of date
+        
+        bins = (math.ceil(size[0] / DENSITY_BIN_SIZE), math.ceil(size[1] / DENSITY_BIN_SIZE))
+        self._counts = np.zeros(bins, dtype=np.int32)
+        self._density = None  # Density map surface, None when out of date
+        
+        # Points above which sprites overlap too much, with hysteresis
+        sprite_area = sprite.get_width() * sprite.get_height()
+        self._density_above = DENSITY_COVERAGE * size[0] * size[1] / sprite_area
+        self._sprites_below = self._density_above / 2
+        self.density_mode = False
+    
+    def clear(self):
+        """Forget all points."""
+        self._layer.fill((0, 0, 0, 0))
+        self._layer_valid = True
+        self._counts.fill(0)
+        self._density = None
+        self.density_mode = False
+    
+    def add(self, point):
+        """Draw a newly inserted point."""
+        self._count(point, 1)
+        if len(self.points) > self._density_above:
+            self.density_mode = True
+        if not self.density_mode and self._layer_valid:
+            self._layer.blit(self.sprite, self._sprite_pos(point))
+        else:
+            self._layer_valid = False
+    
+    def remove(self, point):
+        """Erase a point that was just removed from the index."""
+        self._count(point, -1)
+        if len(self.points) < self._sprites_below:
+            self.density_mode = False
+        if self.density_mode or not self._layer_valid:
+            self._layer_valid = False
+            return
+        
+        # Clear the sprite's area and redraw the neighbours overlapping it
+        area = pygame.Rect(self._sprite_pos(point), self.sprite.get_size())
+        neighbours = self.points.points_in_rect(
+            area.left - self._half_w, area.top - self._half_h,
+            area.right + self._half_w, area.bottom + self._half_h
+        )
+        self._layer.set_clip(area)
+        self._layer.fill((0, 0, 0, 0))
+        self._layer.blits([(self.sprite, self._sprite_pos(other)) for other in neighbours], False)
+        self._layer.set_clip(None)
+    
+    def draw(self, surface):
+        """Draw all points with a single blit."""
+        if self.density_mode:
+            if self._density is None:
+                self._density = self._build_density()
+            surface.blit(self._density, (0, 0))
+            return
+        
+        if not self._layer_valid:
+            self._layer.fill((0, 0, 0, 0))
+            self._layer.blits([(self.sprite, self._sprite_pos(point)) for point in self.points],
+                              False)
+            self._layer_valid = True
+        surface.blit(self._layer, (0, 0))
+    
+    def _sprite_pos(self, point):
+        return (int(point.x) - self._half_w, int(point.y) - self._half_h)
+    
+    def _count(self, point, delta):
+        bx = int(point.x) // DENSITY_BIN_SIZE
+        by = int(point.y) // DENSITY_BIN_SIZE
+        if 0 <= bx < self._counts.shape[0] and 0 <= by < self._counts.shape[1]:
+            self._counts[bx, by] += delta
+            self._density = None
+    
+    def _build_density(self):
+        """Render bin counts as a brown map, darker where points pile up."""
+        counts = self._counts
+        peak = counts.max()
+        alpha = np.zeros(counts.shape, dtype=np.uint8)
+        if peak > 0:
+            # Log scale so sparse areas stay visible next to hot spots
+            shade = np.log1p(counts) / np.log1p(peak)
+            alpha[counts > 0] = (60 + 195 * shade[counts > 0]).astype(np.uint8)
+        
+        bins = pygame.Surface(counts.shape, pygame.SRCALPHA)
+        bins.fill(DENSITY_COLOR)
+        pygame.surfarray.pixels_alpha(bins)[:] = alpha
+        return pygame.transform.scale(bins, (counts.shape[0] * DENSITY_BIN_SIZE,
+                                             counts.shape[1] * DENSITY_BIN_SIZE))
+
+class SegmentLayer:
+    """
+    Layer for an append-only list of line segments, such as the dividing
+    lines of the divide and conquer steps. Only segments appended since the
+    last frame are drawn.
+    """
+    
+    def __init__(self, size, color, width=2):
+        """
+        Args:
+            size (tuple): Width and height of the layer
+            color (tuple): RGB color tuple for the segments
+            width (int): Line width
+        """
+        self.color = color
+        self.width = width
+        self._layer = pygame.Surface(size, pygame.SRCALPHA)
+        self._segments = None  # The list being drawn
+        self._drawn = 0  # How many of its segments are on the layer
+    
+    def draw(self, surface, segments):
+        """
+        Draw a list of (x1, y1, x2, y2) segments with a single blit.
+        
+        Args:
+            surface: Pygame surface to draw on
+            segments (list): Segments; may only grow between calls unless a
+                different list is passed
+        """
+        if segments is not self._segments or len(segments) < self._drawn:
+            self._layer.fill((0, 0, 0, 0))
+            self._segments = segments
+            self._drawn = 0
+        if not segments:
+            return
+        
+        for x1, y1, x2, y2 in segments[self._drawn:]:
+            pygame.draw.line(self._layer, self.color, (x1, y1), (x2, y2), self.width)
+        self._drawn = len(segments)
+        surface.blit(self._layer, (0, 0))
@@ -0,0 +1,281 @@
+"""
+Uniform grid hash for treasure points.
+Supports constant-time insert, delete and hit-testing, and keeps the closest
+pair up to date as points are added or removed.
+"""
+
+import heapq
+import math
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+from closest_pair import Point, ClosestPairResult
+
+# Average points per occupied cell before the grid is refined
+MAX_CELL_LOAD = 4
+# How many times the initial cell size may be halved
+MAX_REFINEMENTS = 6
+
+class SpatialIndex:
+    """
+    Grid hash over points with incremental closest pair tracking.
+
+    Every point records a partner: its nearest neighbour at the time the
+    record was made. For any pair of live points, at least one of them has a
+    partner no farther away than the other point, so the closest pair is
+    always the smallest valid record. Records live in a heap with lazy
+    deletion; removing a point only re-searches the points that had it as
+    their partner.
+    """
+
+    def __init__(self, cell_size: float = 50.0):
+        """
+        Args:
+            cell_size: Initial width of a grid cell. The grid is refined
+                automatically as points get denser.
+        """
+        self.cell_size = cell_size
+        self._initial_cell_size = cell_size
+        self._min_cell_size = cell_size / 2 ** MAX_REFINEMENTS
+        self._cells: Dict[Tuple[int, int], Dict[int, Point]] = {}
+        self._points: Dict[int, Point] = {}  # id(point) -> point, insertion order
+        self._cell_bounds: Optional[List[int]] = None  # [min_cx, min_cy, max_cx, max_cy]
+        self._next_refine = 64  # Point count at which to consider a finer grid
+
+        # Closest pair bookkeeping
+        self._partner: Dict[int, Tuple[float, int]] = {}  # id -> (distance², partner id)
+        self._watchers: Dict[int, Set[int]] = {}  # id -> ids that record it as partner
+        self._pairs: List[Tuple[float, int, int]] = []  # heap of (distance², id, partner id)
+
+    def __len__(self) -> int:
+        return len(self._points)
+
+    def __iter__(self) -> Iterator[Point]:
+        return iter(self._points.values())
+
+    def __contains__(self, point: Point) -> bool:
+        return id(point) in self._points
+
+    def clear(self):
+        """Remove all points."""
+        self.cell_size = self._initial_cell_size
+        self._cells.clear()
+        self._points.clear()
+        self._cell_bounds = None
+        self._next_refine = 64
+        self._partner.clear()
+        self._watchers.clear()
+        self._pairs.clear()
+
+    def insert(self, point: Point):
+        """Add a point to the index."""
+        key = id(point)
+        if key in self._points:
+            return
+
+        nearest = self._nearest(point.x, point.y)
+
+        cell = self._cell_of(point.x, point.y)
+        self._cells.setdefault(cell, {})[key] = point
+        self._points[key] = point
+        self._watchers[key] = set()
+        self._grow_bounds(cell)
+
+        if nearest is not None:
+            self._set_partner(key, *nearest)
+
+        if (len(self._points) >= self._next_refine and
+                len(self._points) > MAX_CELL_LOAD * len(self._cells) and
+                self.cell_size > self._min_cell_size):
+            self._refine()
+
+    def remove(self, point: Point):
+        """Remove a point from the index. Unknown points are ignored."""
+        key = id(point)
+        if key not in self._points:
+            return
+
+        cell = self._cell_of(point.x, point.y)
+        bucket = self._cells[cell]
+        del bucket[key]
+        if not bucket:
+            del self._cells[cell]
+        del self._points[key]
+
+        # Drop our own record
+        if key in self._partner:
+            _, partner = self._partner.pop(key)
+            self._watchers[partner].discard(key)
+
+        # Points that pointed at us need a new nearest neighbour
+        for watcher in self._watchers.pop(key):
+            del self._partner[watcher]
+            other = self._points[watcher]
+            nearest = self._nearest(other.x, other.y, exclude=watcher)
+            if nearest is not None:
+                self._set_partner(watcher, *nearest)
+
+        # Keep stale heap entries from piling up
+        if len(self._pairs) > 2 * len(self._points) + 16:
+            self._pairs = [(dist_sq, key, partner)
+                           for key, (dist_sq, partner) in self._partner.items()]
+            heapq.heapify(self._pairs)
+
+    def nearest(self, x: float, y: float, max_distance: Optional[float] = None) -> Optional[Point]:
+        """
+        Find the point closest to (x, y).
+
+        Args:
+            x: Query x coordinate
+            y: Query y coordinate
+            max_distance: Only consider points strictly closer than this
+
+        Returns:
+            The nearest point, or None if there is none in range
+        """
+        max_sq = float('inf') if max_distance is None else max_distance * max_distance
+        nearest = self._nearest(x, y, max_sq=max_sq)
+        if nearest is None:
+            return None
+        return self._points[nearest[1]]
+
+    def points_in_rect(self, left: float, top: float, right: float, bottom: float) -> List[Point]:
+        """
+        Find the points inside an axis-aligned rectangle (edges included).
+
+        Returns:
+            Matching points, in no particular order
+        """
+        if self._cell_bounds is None:
+            return []
+        min_cx, min_cy, max_cx, max_cy = self._cell_bounds
+        first_cx, first_cy = self._cell_of(left, top)
+        last_cx, last_cy = self._cell_of(right, bottom)
+
+        cx_range = range(max(first_cx, min_cx), min(last_cx, max_cx) + 1)
+        cy_range = range(max(first_cy, min_cy), min(last_cy, max_cy) + 1)
+        if len(cx_range) * len(cy_range) > len(self._cells):
+            # Fewer occupied cells than cells in the rectangle
+            cells = [cell for cell in self._cells if cell[0] in cx_range and cell[1] in cy_range]
+        else:
+            cells = [(cx, cy) for cx in cx_range for cy in cy_range]
+
+        found = []
+        for cell in cells:
+            bucket = self._cells.get(cell)
+            if not bucket:
+                continue
+            for point in bucket.values():
+                if left <= point.x <= right and top <= point.y <= bottom:
+                    found.append(point)
+        return found
+
+    def closest_pair(self) -> Optional[ClosestPairResult]:
+        """Return the current closest pair of points, or None if there are fewer than two."""
+        pairs = self._pairs
+        while pairs:
+            dist_sq, key, partner = pairs[0]
+            if self._partner.get(key) == (dist_sq, partner):
+                return ClosestPairResult(self._points[key], self._points[partner],
+                                         math.sqrt(dist_sq))
+            heapq.heappop(pairs)
+        return None
+
+    def _cell_of(self, x: float, y: float) -> Tuple[int, int]:
+        return (math.floor(x / self.cell_size), math.floor(y / self.cell_size))
+
+    def _refine(self):
+        """Halve the cell size and rehash, so dense regions stay cheap to search."""
+        self.cell_size /= 2
+        self._cells = {}
+        self._cell_bounds = None
+        for key, point in self._points.items():
+            cell = self._cell_of(point.x, point.y)
+            self._cells.setdefault(cell, {})[key] = point
+            self._grow_bounds(cell)
+        # Duplicate-heavy sets may not spread out; wait for the set to double
+        self._next_refine = 2 * len(self._points)
+
+    def _grow_bounds(self, cell: Tuple[int, int]):
+        cx, cy = cell
+        bounds = self._cell_bounds
+        if bounds is None:
+            self._cell_bounds = [cx, cy, cx, cy]
+        else:
+            bounds[0] = min(bounds[0], cx)
+            bounds[1] = min(bounds[1], cy)
+            bounds[2] = max(bounds[2], cx)
+            bounds[3] = max(bounds[3], cy)
+
+    def _set_partner(self, key: int, dist_sq: float, partner: int):
+        self._partner[key] = (dist_sq, partner)
+        self._watchers[partner].add(key)
+        heapq.heappush(self._pairs, (dist_sq, key, partner))
+
+    def _nearest(self, x: float, y: float, exclude: Optional[int] = None,
+                 max_sq: float = float('inf')) -> Optional[Tuple[float, int]]:
+        """
+        Search rings of cells outwards from (x, y).
+
+        Returns:
+            (distance², id) of the nearest point, or None
+        """
+        if self._cell_bounds is None:
+            return None
+
+        cx, cy = self._cell_of(x, y)
+        min_cx, min_cy, max_cx, max_cy = self._cell_bounds
+        last_ring = max(cx - min_cx, max_cx - cx, cy - min_cy, max_cy - cy)
+
+        best_sq = max_sq
+        best = None
+        for ring in range(last_ring + 1):
+            # Every cell in this ring is at least (ring - 1) cells away
+            reach = (ring - 1) * self.cell_size
+            if ring > 1 and reach * reach >= best_sq:
+                break
+            if 8 * ring > len(self._cells):
+                # Around clustered points most ring cells are empty; the
+                # occupied cells from this ring outwards are fewer
+                cells = [cell for cell in self._cells
+                         if max(abs(cell[0] - cx), abs(cell[1] - cy)) >= ring]
+                cells.sort(key=lambda cell: max(abs(cell[0] - cx), abs(cell[1] - cy)))
+                for cell in cells:
+                    reach = (max(abs(cell[0] - cx), abs(cell[1] - cy)) - 1) * self.cell_size
+                    if reach > 0 and reach * reach >= best_sq:
+                        break
+                    best_sq, best = self._scan_cell(cell, x, y, exclude, best_sq, best)
+                break
+            for cell in _ring_cells(cx, cy, ring):
+                best_sq, best = self._scan_cell(cell, x, y, exclude, best_sq, best)
+
+        if best is None:
+            return None
+        return best_sq, best
+
+    def _scan_cell(self, cell: Tuple[int, int], x: float, y: float, exclude: Optional[int],
+                   best_sq: float, best: Optional[int]) -> Tuple[float, Optional[int]]:
+        """Improve (best_sq, best) with the points in one cell."""
+        bucket = self._cells.get(cell)
+        if not bucket:
+            return best_sq, best
+        for key, point in bucket.items():
+            if key == exclude:
+                continue
+            dx = point.x - x
+            dy = point.y - y
+            dist_sq = dx * dx + dy * dy
+            if dist_sq < best_sq:
+                best_sq, best = dist_sq, key
+        return best_sq, best
+
+def _ring_cells(cx: int, cy: int, ring: int) -> Iterator[Tuple[int, int]]:
+    """Yield the cells on the square ring at Chebyshev distance `ring` from (cx, cy)."""
+    if ring == 0:
+        yield (cx, cy)
+        return
+    for dx in range(-ring, ring + 1):
+        yield (cx + dx, cy - ring)
+        yield (cx + dx, cy + ring)
+    for dy in range(-ring + 1, ring):
+        yield (cx - ring, cy + dy)
+        yield (cx + ring, cy + dy)